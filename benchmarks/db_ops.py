@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the Database get/get_all/insert/update/delete/increment calls, against whichever engine settings.json
+is configured to use (db_engine "mysql" or "sqlite"), so the two can be compared with the same workload.
+The rows are written to a benchmark_rows table, which is created at the start and dropped at the end.
+
+Run from the root directory: `python benchmarks/db_ops.py [rows]`
+"""
+import os, sys, time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import lib
+from structures.db import Database
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+TABLE = """CREATE TABLE IF NOT EXISTS benchmark_rows (
+    id INTEGER PRIMARY KEY auto_increment,
+    user BIGINT UNSIGNED NOT NULL,
+    name VARCHAR(255) NOT NULL,
+    value INTEGER DEFAULT 0
+) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci"""
+
+def run(name, fn, count):
+    start = time.perf_counter()
+    for i in range(count):
+        fn(i)
+    taken = time.perf_counter() - start
+    print('{:<14} {:>8} {:>10.3f} ms {:>10.1f} us'.format(name, count, taken * 1000, taken / count * 1e6))
+
+if __name__ == '__main__':
+
+    db = Database.instance()
+    config = lib.get_config()
+    print('Engine: ' + getattr(config, 'db_engine', 'mysql') + ', rows: ' + str(ROWS))
+
+    db.execute('DROP TABLE IF EXISTS benchmark_rows', [])
+    db.execute(TABLE, [])
+    db.execute('CREATE UNIQUE INDEX IF NOT EXISTS uniq_user_name ON benchmark_rows (user, name)', [])
+
+    print('{:<14} {:>8} {:>13} {:>13}'.format('operation', 'calls', 'total', 'per call'))
+    run('insert', lambda i: db.insert('benchmark_rows', {'user': i, 'name': 'words', 'value': i}), ROWS)
+    run('get', lambda i: db.get('benchmark_rows', {'user': i, 'name': 'words'}), ROWS)
+    run('get_sql', lambda i: db.get_sql('SELECT value FROM benchmark_rows WHERE user = %s AND name = %s', [i, 'words']), ROWS)
+    run('get_all', lambda i: db.get_all('benchmark_rows', None, ['*'], ['value DESC'], 100), max(1, ROWS // 10))
+    run('update', lambda i: db.update('benchmark_rows', {'value': 0}, {'user': i, 'name': 'words'}), ROWS)
+    run('increment', lambda i: db.increment('benchmark_rows', 'value', 5, {'user': i, 'name': 'words'}), ROWS)
+    run('insert_many', lambda i: db.insert_many('benchmark_rows', [{'user': i, 'name': 'bulk' + str(n), 'value': n} for n in range(100)]), max(1, ROWS // 100))
+    run('delete', lambda i: db.delete('benchmark_rows', {'user': i, 'name': 'words'}), ROWS)
+
+    db.execute('DROP TABLE IF EXISTS benchmark_rows', [])
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark of NameGenerator.generate for every gen_* asset at MAX_AMOUNT.
+Compares the old regex substitution engine against the compiled grammars. Both use the cached assets from
+lib.get_asset, so only the generation itself is measured.
+Then compares generating BULK_AMOUNT names one at a time against the batched numpy draws which generate_batch uses for
+batches of at least NameGenerator.NUMPY_BATCH_SIZE names, both seeded.
+
+Run from the root directory: `python benchmarks/generate.py`
+"""
+import os, random, re, sys, time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import lib
+from structures.generator import NameGenerator
+
+ITERATIONS = 200
+BULK_AMOUNT = 10000
+SEED = 1
+TYPES = sorted(file[4:-5] for file in os.listdir('./assets/json/en') if file.startswith('gen_'))
+
+class Context:
+    """
+    Just enough of a command context for the generator
+    """
+    class Guild:
+        id = 0
+
+    guild = Guild()
+
+def legacy_generate(type, context, amount):
+    """
+    The name generation loop from before the grammars were compiled
+    """
+    generator = NameGenerator
+    source = lib.get_asset('gen_' + type, context.guild.id)
+    generated_names = []
+    retry_attempts = 0
+    choices = source['names']
+    last = ['']
+
+    def replace(match):
+        match = match.group().replace('$', '')
+        if match in choices.keys():
+            choice = random.choice(choices[match])
+            i = 0
+            while len(choice) > 2 and choice == last[0] and i < generator.MAX_RETRIES:
+                i += 1
+                choice = random.choice(choices[match])
+            last[0] = choice
+            return choice
+        else:
+            last[0] = match
+            return match
+
+    x = 0
+    while x < amount:
+        x += 1
+        format = random.choice(source['formats'])
+        last[0] = ''
+        name = re.sub(r"\$([a-z0-9]+)", replace, format)
+        if name in generated_names and retry_attempts < generator.MAX_RETRIES:
+            x -= 1
+            retry_attempts += 1
+        else:
+            generated_names.append(name)
+            retry_attempts = 0
+
+    generated_names.sort()
+    return generated_names
+
+def run_bulk(type):
+    generator = NameGenerator(type, Context(), SEED)
+    grammar = generator.get_grammar()
+
+    start = time.perf_counter()
+    [generator.generate_name(grammar) for x in range(BULK_AMOUNT)]
+    before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    generator.generate_batch(grammar, BULK_AMOUNT)
+    after = time.perf_counter() - start
+
+    print('{:<14} {:>10.2f} ms {:>10.2f} ms {:>8.2f}x'.format(type, before * 1000, after * 1000, before / after))
+    return before, after
+
+def run(type):
+    context = Context()
+
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        legacy_generate(type, context, NameGenerator.MAX_AMOUNT)
+    before = time.perf_counter() - start
+
+    generator = NameGenerator(type, context)
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        generator.generate(NameGenerator.MAX_AMOUNT)
+    after = time.perf_counter() - start
+
+    print('{:<14} {:>10.1f} us {:>10.1f} us {:>8.2f}x'.format(type, before / ITERATIONS * 1e6, after / ITERATIONS * 1e6, before / after))
+    return before, after
+
+if __name__ == '__main__':
+
+    # Load the assets before we start timing
+    for type in TYPES:
+        lib.get_asset('gen_' + type, Context.guild.id)
+
+    print('{:<14} {:>13} {:>13} {:>9}'.format('type', 'before/call', 'after/call', 'speedup'))
+    totals = [run(type) for type in TYPES]
+    before = sum(total[0] for total in totals)
+    after = sum(total[1] for total in totals)
+    print('{:<14} {:>10.1f} us {:>10.1f} us {:>8.2f}x'.format('all', before / ITERATIONS * 1e6, after / ITERATIONS * 1e6, before / after))
+
+    print()
+    print('{:<14} {:>13} {:>13} {:>9}'.format('type', 'single/' + str(BULK_AMOUNT), 'numpy/' + str(BULK_AMOUNT), 'speedup'))
+    totals = [run_bulk(type) for type in TYPES]
+    before = sum(total[0] for total in totals)
+    after = sum(total[1] for total in totals)
+    print('{:<14} {:>10.2f} ms {:>10.2f} ms {:>8.2f}x'.format('all', before * 1000, after * 1000, before / after))
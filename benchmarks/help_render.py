@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+End to end benchmark of the `help` command, rendering the main page and every subcommand page.
+Compares looking up the guild's language for each string (how lib.get_string works, and how `help` used to render)
+against the bound string bundle from lib.strings.
+
+Run from the root directory: `python benchmarks/help_render.py [guild_id]`
+"""
+import asyncio, os, sys, time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import lib
+from cogs.util.help import Help
+
+ITERATIONS = 200
+GUILD_ID = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+COMMANDS = ['help', 'about', 'ask', 'challenge', '8ball', 'event', 'flip', 'generate', 'goal', 'mysetting', 'ping',
+            'profile', 'project', 'quote', 'reassure', 'reset', 'roll', 'sprint', 'wrote', 'xp', 'remind']
+
+class Context:
+    """
+    Just enough of a command context for the help command to render and "send" its embeds
+    """
+    class Object:
+        def __init__(self, id):
+            self.id = id
+
+    def __init__(self, guild_id):
+        self.guild = self.Object(guild_id)
+        self.message = self.Object(None)
+        self.message.author = self.Object(1)
+        self.sent = 0
+
+    async def send(self, *args, **kwargs):
+        self.sent += 1
+
+class LegacyStrings:
+    """
+    Looks up the guild's language again for every string, like the lib.get_string calls did
+    """
+    def __init__(self, guild_id):
+        self.guild_id = guild_id
+
+    def __getitem__(self, key):
+        return lib.get_string(key, self.guild_id)
+
+async def run(name):
+    cog = Help(None)
+    context = Context(GUILD_ID)
+
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        for command in COMMANDS:
+            await Help.help.callback(cog, context, command)
+    taken = time.perf_counter() - start
+
+    per_help = taken / (ITERATIONS * len(COMMANDS))
+    print('{:<10} {:>10.3f} ms total {:>10.1f} us per page ({} pages)'.format(name, taken * 1000, per_help * 1e6, context.sent))
+    return taken
+
+if __name__ == '__main__':
+
+    # Warm up the language map and catalogs, so we only measure the rendering
+    lib.load_catalogs()
+    lib.get_lang(GUILD_ID)
+
+    bundle = lib.strings
+    lib.strings = LegacyStrings
+    before = asyncio.run(run('before'))
+
+    lib.strings = bundle
+    after = asyncio.run(run('after'))
+
+    print('Speedup: {:.2f}x'.format(before / after))
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark of lib.get over the language files, the database updates and settings.json.
+Compares the old loader, which made a new namedtuple class for every JSON object, against the cached record types
+with the json module, and with orjson if it is installed.
+
+Run from the root directory: `python benchmarks/json_load.py`
+"""
+import json, os, sys, time
+from collections import namedtuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import lib
+
+ITERATIONS = 200
+SETTINGS = './settings.json' if os.path.exists('./settings.json') else './settings.dist.json'
+
+# (file, as_object), loaded the same way the bot loads them
+FILES = [('./data/lang/' + file, False) for file in sorted(os.listdir('./data/lang')) if file.endswith('.json')]
+FILES += [('./data/updates/' + file, True) for file in sorted(os.listdir('./data/updates')) if file.endswith('.update')]
+FILES += [(SETTINGS, True), ('./version.json', True)]
+
+def legacy_get(file, as_object=True):
+    with open(file, 'r') as data:
+        if as_object:
+            return json.load(data, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+        else:
+            return json.load(data)
+
+def run(name, fn, file, as_object):
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        fn(file, as_object)
+    return (time.perf_counter() - start) / ITERATIONS
+
+if __name__ == '__main__':
+
+    orjson = lib.orjson
+    columns = ['before', 'json'] + (['orjson'] if orjson is not None else [])
+    print(('{:<36}' + ' {:>12}' * len(columns)).format('file', *columns))
+
+    totals = [0.0] * len(columns)
+    for file, as_object in FILES:
+
+        times = [run('before', legacy_get, file, as_object)]
+
+        lib.orjson = None
+        times.append(run('json', lib.get, file, as_object))
+
+        if orjson is not None:
+            lib.orjson = orjson
+            times.append(run('orjson', lib.get, file, as_object))
+
+        totals = [total + taken for total, taken in zip(totals, times)]
+        print(('{:<36}' + ' {:>9.1f} us' * len(times)).format(file, *(taken * 1e6 for taken in times)))
+
+    lib.orjson = orjson
+    print(('{:<36}' + ' {:>9.1f} us' * len(totals)).format('all', *(total * 1e6 for total in totals)))
+    print('Speedup: ' + ', '.join('{} {:.2f}x'.format(column, totals[0] / total) for column, total in zip(columns[1:], totals[1:])))
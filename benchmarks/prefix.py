@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark of WriterBot.load_prefix, which runs for every message the bot can see.
+Compares querying the prefix of every guild through the connection pool for each message (how load_prefix used to
+work) against the prefix map which is loaded at startup. Uses the guild_settings in the configured database.
+
+Run from the root directory: `python benchmarks/prefix.py [messages]`
+"""
+import asyncio, os, random, sys, time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import lib
+from bot import WriterBot
+from discord.ext import commands
+from structures.db import DatabasePool
+
+MESSAGES = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+class Object:
+    def __init__(self, id):
+        self.id = id
+
+class Bot:
+    """
+    Just enough of the bot for load_prefix
+    """
+    user = Object(1)
+    prefixes = None
+    load_prefixes = WriterBot.load_prefixes
+
+async def legacy_load_prefix(bot, message):
+    """
+    load_prefix from before the prefix map
+    """
+    pool = DatabasePool.instance()
+    prefixes = {}
+    config = lib.get_config()
+
+    settings = await pool.get_all('guild_settings', {'setting': 'prefix'})
+    for setting in settings:
+        prefixes[int(setting['guild'])] = setting['value']
+
+    if message.guild is not None:
+        prefix = prefixes.get(message.guild.id, config.prefix)
+    else:
+        prefix = config.prefix
+
+    return commands.when_mentioned_or(prefix)(bot, message)
+
+def get_messages():
+    """
+    Messages from the guilds which have a prefix, some from guilds which don't and some DMs
+    """
+    guilds = [Object(id) for id in Bot.prefixes] + [Object(id) for id in range(1, 11)] + [None]
+    messages = []
+    for i in range(MESSAGES):
+        message = Object(i)
+        message.guild = random.choice(guilds)
+        messages.append(message)
+    return messages
+
+async def run_before(bot, messages):
+    start = time.perf_counter()
+    for message in messages:
+        await legacy_load_prefix(bot, message)
+    return time.perf_counter() - start
+
+def run_after(bot, messages):
+    start = time.perf_counter()
+    for message in messages:
+        WriterBot.load_prefix(bot, message)
+    return time.perf_counter() - start
+
+if __name__ == '__main__':
+
+    bot = Bot()
+    bot.load_prefixes()
+    Bot.prefixes = bot.prefixes
+    messages = get_messages()
+
+    before = asyncio.run(run_before(bot, messages))
+    after = run_after(bot, messages)
+
+    print('Guilds with a prefix: {}'.format(len(bot.prefixes)))
+    print('{:<8} {:>12.0f} messages/sec'.format('before', len(messages) / before))
+    print('{:<8} {:>12.0f} messages/sec'.format('after', len(messages) / after))
+    print('Speedup: {:.1f}x'.format(before / after))
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for building the SQL of the Database get/insert/update/delete helpers.
+Compares the old string concatenation builders against the cached statement templates.
+
+Run from the root directory: `python benchmarks/sql_build.py`
+"""
+import os, sys, timeit
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from structures import db
+
+ITERATIONS = 100000
+
+def legacy_build_get(table, where=None, fields=['*'], sort=None, limit=None):
+    params = []
+    sql = 'SELECT ' + ', '.join(fields) + ' ' 'FROM ' + table + ' '
+    if where is not None:
+        sql += 'WHERE '
+        for field, value in where.items():
+            sql += field + ' = %s AND '
+            params.append(value)
+        sql = sql[:-4]
+    if sort is not None:
+        sql += ' ORDER BY ' + ', '.join(sort)
+    if limit is not None:
+        sql += ' LIMIT ' + str(limit)
+    return sql, params
+
+def legacy_build_insert(table, params):
+    placeholders = ['%s'] * len(params.values())
+    sql = 'INSERT INTO ' + table + ' '
+    sql += '(' + ','.join(params.keys()) + ') '
+    sql += 'VALUES '
+    sql += '(' + ','.join(placeholders) + ') '
+    return sql, list(params.values())
+
+def legacy_build_delete(table, params):
+    sql_params = []
+    sql = 'DELETE FROM ' + table + ' WHERE '
+    for field, value in params.items():
+        sql += field + ' = %s AND '
+        sql_params.append(value)
+    sql = sql[:-4]
+    return sql, sql_params
+
+def legacy_build_update(table, params, where=None):
+    sql_params = []
+    sql = 'UPDATE ' + table + ' SET '
+    for field, value in params.items():
+        sql += field + ' = %s, '
+        sql_params.append(value)
+    sql = sql[:-2]
+    if where is not None:
+        sql += ' WHERE '
+        for field, value in where.items():
+            sql += field + ' = %s AND '
+            sql_params.append(value)
+        sql = sql[:-4]
+    return sql, sql_params
+
+# Typical calls made by the structures, e.g. User.get_stat, Project.all, Sprint.join, Task.delete
+CASES = {
+    'get': ('user_stats', {'user': 123456789012345678, 'name': 'total_words_written'}),
+    'get_sorted': ('projects', {'user': 123456789012345678}, ['id'], ['name', 'shortname', 'words'], 10),
+    'insert': ('sprint_users', {'sprint': 1, 'user': 123456789012345678, 'starting_wc': 0, 'current_wc': 0, 'ending_wc': 0, 'timejoined': 1600000000}),
+    'update': ('user_goals', {'current': 500, 'completed': 0}, {'id': 42}),
+    'delete': ('tasks', {'id': 42}),
+}
+
+def run(name, legacy, cached, args):
+    before = timeit.timeit(lambda: legacy(*args), number=ITERATIONS)
+    after = timeit.timeit(lambda: cached(*args), number=ITERATIONS)
+    print('{:<12} {:>10.3f} us {:>10.3f} us {:>8.2f}x'.format(name, before / ITERATIONS * 1e6, after / ITERATIONS * 1e6, before / after))
+
+if __name__ == '__main__':
+    print('{:<12} {:>13} {:>13} {:>9}'.format('operation', 'before/call', 'after/call', 'speedup'))
+    run('get', legacy_build_get, db._build_get, CASES['get'])
+    run('get_sorted', legacy_build_get, db._build_get, CASES['get_sorted'])
+    run('insert', legacy_build_insert, db._build_insert, CASES['insert'])
+    run('update', legacy_build_update, db._build_update, CASES['update'])
+    run('delete', legacy_build_delete, db._build_delete, CASES['delete'])
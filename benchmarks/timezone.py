@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the timezone lookups used by mysetting, reminders and goal resets.
+Compares scanning a lowercased list of pytz.all_timezones and calling pytz.timezone every time (how lib used to do it)
+against the case-insensitive name index and the cache of loaded timezones.
+
+Run from the root directory: `python benchmarks/timezone.py`
+"""
+import os, pytz, sys, time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import lib
+
+ITERATIONS = 20000
+NAMES = ['Europe/London', 'america/new_york', 'Pacific/Auckland', 'UTC', 'Not/A_Timezone']
+
+def legacy_is_valid_timezone(timezone):
+    if not timezone:
+        return False
+
+    timezones = [x.lower() for x in pytz.all_timezones]
+    return timezone.lower() in timezones
+
+def legacy_get_timezone(timezone):
+    return pytz.timezone(timezone) if legacy_is_valid_timezone(timezone) else None
+
+def run(name, before_fn, after_fn):
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        for timezone in NAMES:
+            before_fn(timezone)
+    before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        for timezone in NAMES:
+            after_fn(timezone)
+    after = time.perf_counter() - start
+
+    calls = ITERATIONS * len(NAMES)
+    print('{:<20} {:>10.2f} us {:>10.3f} us {:>10.1f}x'.format(name, before / calls * 1e6, after / calls * 1e6, before / after))
+
+if __name__ == '__main__':
+
+    print('{:<20} {:>13} {:>13} {:>11}'.format('call', 'before/call', 'after/call', 'speedup'))
+    run('is_valid_timezone', legacy_is_valid_timezone, lib.is_valid_timezone)
+    run('get_timezone', legacy_get_timezone, lib.get_timezone)
@@ -2,6 +2,7 @@ import os, datetime, time, lib, traceback, discord
 from discord.ext import tasks
 from discord.ext import commands
 from discord.ext.commands import AutoShardedBot
+from structures import assetpack
 from structures.db import *
 from structures.guild import Guild
 from structures.task import Task
@@ -15,11 +16,22 @@ class WriterBot(AutoShardedBot):
 
     def __init__(self, *args, **kwargs):
         super().__init__(help_command=commands.DefaultHelpCommand(dm_help=True), *args, **kwargs)
-        self.config = lib.get('./settings.json')
         self.start_time = time.time()
+        self.boot_times = {}
         self.app_info = None
+
+        # Prefix of each guild which has set one, so we don't have to query them for every message.
+        self.prefixes = None
         self.setup()
 
+    @property
+    def config(self):
+        """
+        The bot's settings, which can be reloaded with `admin reload`
+        :return:
+        """
+        return lib.get_config()
+
     async def on_message(self, message):
         """
         Run any checks we need to, before processing the messages.
@@ -39,6 +51,10 @@ class WriterBot(AutoShardedBot):
         """
         lib.debug('Logged on as: ' + str(self.user))
 
+        # This is run again on reconnects, but we only want the time it took to be ready after booting.
+        if 'ready' not in self.boot_times:
+            self.log_boot_phase('ready', self.start_time)
+
         # Show the help command on the status
         await self.change_presence(activity=discord.Game(self.config.prefix + 'help'))
 
@@ -85,6 +101,8 @@ class WriterBot(AutoShardedBot):
         Load all the commands from the cogs/ directory.
         :return: void
         """
+        start = time.time()
+
         # Find all the command groups in the cogs/ directory
         for dir in self.COMMAND_GROUPS:
 
@@ -103,6 +121,34 @@ class WriterBot(AutoShardedBot):
                         lib.out(f'[EXT][{dir}.{cog}] failed to load')
                         lib.out(e)
 
+        self.log_boot_phase('cogs', start)
+
+    def log_boot_phase(self, phase, start):
+        """
+        Log how long a phase of the boot process took, so we can see if startup is getting slower
+        :param phase:
+        :param start: Timestamp the phase started at
+        :return:
+        """
+        self.boot_times[phase] = time.time() - start
+        lib.out('[BOOT] {} took {:.2f}s'.format(phase, self.boot_times[phase]))
+
+    def is_schema_current(self, fingerprint):
+        """
+        Check if the schema fingerprint stored in the database matches the one for our install and update files
+        :param fingerprint:
+        :return: bool
+        """
+        db = Database.instance()
+
+        # On a new database the bot_settings table won't exist yet, so the query fails.
+        try:
+            setting = db.get('bot_settings', {'setting': 'schema'})
+        except Exception:
+            return False
+
+        return setting is not None and setting['value'] == fingerprint
+
     def update(self):
         """
         Run any database updates which are required
@@ -119,8 +165,8 @@ class WriterBot(AutoShardedBot):
         version = int(version)
         current_version = int(current_version)
 
-        # Find all update files
-        for file in os.listdir(f'data/updates'):
+        # Find all update files, in version order, as later updates can depend on earlier ones.
+        for file in sorted(os.listdir(f'data/updates')):
 
             # If it ends with .update then try to use it.
             if file.endswith(".update"):
@@ -133,11 +179,17 @@ class WriterBot(AutoShardedBot):
 
                     # Load the file and the SQL to run.
                     update = lib.get('./data/updates/' + file)
+                    update_start = time.time()
 
                     # Loop through the array of SQL statements to run.
+                    # Some of these can be slow on large tables, so report how long each one takes.
                     for sql in update:
                         lib.out('[UPDATE] Running query `' + sql + '`')
-                        db.execute(sql, [])
+                        query_start = time.time()
+                        rows = db.execute(sql, [])
+                        lib.out('[UPDATE] Query finished in {:.2f}s ({} rows affected)'.format(time.time() - query_start, rows))
+
+                    lib.out('[UPDATE] Update {} finished in {:.2f}s'.format(update_version, time.time() - update_start))
 
         # Once it's done, update the version in the database.
         setting = db.get('bot_settings', {'setting': 'version'})
@@ -153,17 +205,50 @@ class WriterBot(AutoShardedBot):
         """
         lib.out('[BOT] Beginning boot process')
 
-        # Install the database.
         db = Database.instance()
-        db.install()
-        lib.out('[DB] Database tables installed')
+        fingerprint = db.get_schema_fingerprint()
+
+        # If the install and update files haven't changed since they were last run, there is nothing to do.
+        if self.is_schema_current(fingerprint):
+            lib.out('[DB] Database schema is up to date, skipping install and updates')
+        else:
 
-        # Run any database updates.
-        self.update()
+            # Install the database.
+            start = time.time()
+            db.install()
+            lib.out('[DB] Database tables installed')
+            self.log_boot_phase('install', start)
+
+            # Run any database updates.
+            start = time.time()
+            self.update()
+            self.log_boot_phase('update', start)
+
+            # Store the fingerprint, so the next boot can skip all of that.
+            if db.get('bot_settings', {'setting': 'schema'}):
+                db.update('bot_settings', {'value': fingerprint}, {'setting': 'schema'})
+            else:
+                db.insert('bot_settings', {'setting': 'schema', 'value': fingerprint})
+
+        # Load the language strings.
+        lib.out('[LANG] Loaded {} language catalogs'.format(lib.load_catalogs()))
+
+        # Load the language of every guild in one go, rather than one query per guild as strings are needed.
+        lib.out('[LANG] Loaded language settings for {} guilds'.format(lib.load_langs()))
+
+        # Load the prefix of every guild which has changed it, as load_prefix needs them for every message.
+        lib.out('[PREFIX] Loaded prefixes for {} guilds'.format(self.load_prefixes()))
+
+        # Build the memory-mapped packs of any generator assets which have changed since they were last built.
+        start = time.time()
+        lib.out('[ASSET] Built {} asset packs'.format(assetpack.build_all()))
+        self.log_boot_phase('assets', start)
 
         # Setup the recurring tasks which need running.
+        start = time.time()
         self.setup_recurring_tasks()
         lib.out('[TASK] Recurring tasks inserted')
+        self.log_boot_phase('tasks', start)
 
         # Restart all tasks which are marked as processing, in case the bot dropped out during the process.
         db.update('tasks', {'processing': 0})
@@ -184,6 +269,32 @@ class WriterBot(AutoShardedBot):
         db.delete('tasks', {'object': 'reminder', 'type': 'send'})
         db.insert('tasks', {'object': 'reminder', 'time': 0, 'type': 'send', 'recurring': 1, 'runeveryseconds': 30})
 
+    def load_prefixes(self):
+        """
+        Load the prefix of every guild which has set one into the prefix map
+        :return: int Number of guilds with a prefix set
+        """
+        db = Database.instance()
+        prefixes = {}
+
+        for setting in db.get_all('guild_settings', {'setting': 'prefix'}):
+            prefixes[int(setting['guild'])] = setting['value']
+
+        self.prefixes = prefixes
+        return len(prefixes)
+
+    def set_prefix(self, guild_id, prefix):
+        """
+        Update a guild's prefix in the prefix map, after it has been changed with `setting prefix`
+        :param guild_id:
+        :param prefix:
+        :return:
+        """
+        if self.prefixes is None:
+            self.load_prefixes()
+
+        self.prefixes[int(guild_id)] = prefix
+
     @staticmethod
     def load_prefix(bot, message):
         """
@@ -192,18 +303,15 @@ class WriterBot(AutoShardedBot):
         :param message:
         :return:
         """
-        db = Database.instance()
-        prefixes = {}
-        config = lib.get('./settings.json')
+        config = lib.get_config()
 
-        # Get the guild_settings for prefix and add to a dictionary, with the guild id as the key.
-        settings = db.get_all('guild_settings', {'setting': 'prefix'})
-        for setting in settings:
-            prefixes[int(setting['guild'])] = setting['value']
+        # This runs for every message, so the prefixes are kept in memory rather than queried each time.
+        if bot.prefixes is None:
+            bot.load_prefixes()
 
-        # If the guild id exists in this dictionary return that, otherwise return the default.
+        # If the guild has set a prefix use that, otherwise use the default.
         if message.guild is not None:
-            prefix = prefixes.get(message.guild.id, config.prefix)
+            prefix = bot.prefixes.get(message.guild.id, config.prefix)
         else:
             prefix = config.prefix
 
@@ -26,22 +26,23 @@ class About(commands.Cog):
         guild_id = context.guild.id
         config = self.bot.config
         sprints = self.__db.get('sprints', {'completed': 0}, ['COUNT(id) as cnt'])['cnt']
+        strings = lib.strings(guild_id)
 
         # Begin the embedded message
-        embed = discord.Embed(title=lib.get_string('info:bot', guild_id), color=3447003)
-        embed.add_field(name=lib.get_string('info:version', guild_id), value=config.version, inline=True)
-        embed.add_field(name=lib.get_string('info:uptime', guild_id), value=str(datetime.timedelta(seconds=uptime)), inline=True)
-        embed.add_field(name=lib.get_string('info:owner', guild_id), value=str(self.bot.app_info.owner), inline=True)
+        embed = discord.Embed(title=strings['info:bot'], color=3447003)
+        embed.add_field(name=strings['info:version'], value=config.version, inline=True)
+        embed.add_field(name=strings['info:uptime'], value=str(datetime.timedelta(seconds=uptime)), inline=True)
+        embed.add_field(name=strings['info:owner'], value=str(self.bot.app_info.owner), inline=True)
 
         # Statistics
         stats = []
-        stats.append('• ' + lib.get_string('info:servers', guild_id) + ': ' + format(len(self.bot.guilds)))
-        stats.append('• ' + lib.get_string('info:members', guild_id) + ': ' + format(self.count_members(self.bot.guilds)))
-        stats.append('• ' + lib.get_string('info:sprints', guild_id) + ': ' + str(sprints))
-        stats.append('• ' + lib.get_string('info:helpserver', guild_id) + ': ' + config.help_server)
+        stats.append('• ' + strings['info:servers'] + ': ' + format(len(self.bot.guilds)))
+        stats.append('• ' + strings['info:members'] + ': ' + format(self.count_members(self.bot.guilds)))
+        stats.append('• ' + strings['info:sprints'] + ': ' + str(sprints))
+        stats.append('• ' + strings['info:helpserver'] + ': ' + config.help_server)
         stats = '\n'.join(stats)
 
-        embed.add_field(name=lib.get_string('info:generalstats', guild_id), value=stats, inline=False)
+        embed.add_field(name=strings['info:generalstats'], value=stats, inline=False)
 
         # Developer Info
         git = {}
@@ -49,13 +50,13 @@ class About(commands.Cog):
         git['rev'] =  os.popen(r'git log --pretty=format:"%h | %ad | %s" --date=short -n 1').read().strip()
 
         dev = []
-        dev.append(lib.get_string('info:dev:branch', guild_id) + ': ' + format(git['branch']))
-        dev.append(lib.get_string('info:dev:repo', guild_id) + ': ' + format(config.src))
-        dev.append(lib.get_string('info:dev:patch', guild_id) + ': ' + format(config.patch_notes))
-        dev.append(lib.get_string('info:dev:change', guild_id) + ':\n\t' + format(git['rev']))
+        dev.append(strings['info:dev:branch'] + ': ' + format(git['branch']))
+        dev.append(strings['info:dev:repo'] + ': ' + format(config.src))
+        dev.append(strings['info:dev:patch'] + ': ' + format(config.patch_notes))
+        dev.append(strings['info:dev:change'] + ':\n\t' + format(git['rev']))
         dev = '\n'.join(dev)
 
-        embed.add_field(name=lib.get_string('info:dev', guild_id), value=dev, inline=False)
+        embed.add_field(name=strings['info:dev'], value=dev, inline=False)
 
         # Send the message
         await context.send(embed=embed)
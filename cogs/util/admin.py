@@ -1,5 +1,8 @@
-import discord, lib
+import discord, lib, time
 from discord.ext import commands
+from structures.cache import RowCache
+from structures.db import Database
+from structures.querystats import QueryStats
 from structures.user import User
 from structures.wrapper import CommandWrapper
 
@@ -7,7 +10,7 @@ class Admin(commands.Cog, CommandWrapper):
 
     def __init__(self, bot):
         self.bot = bot
-        self._supported_commands = ['status']
+        self._supported_commands = ['status', 'dbstats', 'reload']
         self._arguments = [
             {
                 'key': 'cmd',
@@ -42,6 +45,10 @@ class Admin(commands.Cog, CommandWrapper):
 
         if cmd == 'status':
             return await self.run_status(context, opts)
+        elif cmd == 'dbstats':
+            return await self.run_dbstats(context, opts)
+        elif cmd == 'reload':
+            return await self.run_reload(context, opts)
 
 
     async def run_status(self, context, opts):
@@ -53,5 +60,70 @@ class Admin(commands.Cog, CommandWrapper):
         status = " ".join(opts[0:])
         return await self.bot.change_presence(activity=discord.Game(status))
 
+    async def run_reload(self, context, opts):
+        """
+        Reload the language catalogs and settings, so changes to them can go live without a restart
+        :param opts:
+        :return:
+        """
+        lib.reload_config()
+        catalogs = lib.load_catalogs()
+        return await context.send(lib.get_string('admin:reload', context.guild.id).format(catalogs))
+
+    async def run_dbstats(self, context, opts):
+        """
+        Show the database queries which have taken the most total time, e.g. `admin dbstats 5`
+        :param opts:
+        :return:
+        """
+        limit = int(opts[0]) if opts and opts[0].isdigit() else 10
+        stats = QueryStats.instance()
+        top = stats.top(limit)
+
+        if not top:
+            return await context.send(lib.get_string('admin:dbstats:none', context.guild.id))
+
+        strings = lib.strings(context.guild.id)
+        columns = ('table', 'count', 'total', 'avg', 'p95', 'max')
+
+        minutes = int((time.time() - stats.get_since()) / 60)
+        lines = [strings.get('admin:dbstats:header', minutes), '']
+        lines.append('{:<30} {:>8} {:>10} {:>8} {:>8} {:>8}'.format(*[strings['admin:dbstats:column:' + column] for column in columns]))
+
+        for stat in top:
+
+            lines.append('{:<30} {:>8} {:>10.0f} {:>8.1f} {:>8.0f} {:>8.0f}'.format(
+                stat['table'] + '.' + stat['operation'],
+                stat['count'],
+                stat['total'],
+                stat['total'] / stat['count'],
+                stat['percentile'],
+                stat['max']
+            ))
+
+            # Show which methods spent the most time on it
+            callers = sorted(stat['callers'].items(), key=lambda caller: caller[1], reverse=True)[:3]
+            for caller, total in callers:
+                lines.append('    ' + '{:<36} {:>10.0f}'.format(caller, total))
+
+        # Show how much the row cache is saving us
+        cache = RowCache.instance().get_stats()
+        lines.append('')
+        lines.append(strings.get('admin:dbstats:cache', cache['hits'], cache['misses'], cache['hit_rate'], cache['entries'], cache['invalidations'], cache['evictions']))
+
+        # Show whether calls are waiting on the offload worker threads
+        queue = Database.instance().get_queue_stats()
+        if queue['threads']:
+            lines.append(strings.get('admin:dbstats:queue', queue['threads'], queue['pending'], queue['queued'], queue['peak'], queue['submitted'], queue['wait_avg'], queue['wait_max']))
+        else:
+            lines.append(strings['admin:dbstats:queue:off'])
+
+        langs = lib.get_lang_stats()
+        lines.append(strings.get('admin:dbstats:langs', langs['hits'], langs['misses'], langs['guilds']))
+
+        # Discord messages are limited to 2000 characters
+        message = '\n'.join(lines)[:1980]
+        return await context.send('```' + message + '```')
+
 def setup(bot):
     bot.add_cog(Admin(bot))
\ No newline at end of file
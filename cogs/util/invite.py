@@ -13,7 +13,7 @@ class Invite(commands.Cog):
         if not Guild(context.guild).is_command_enabled('invite'):
             return await context.send(lib.get_string('err:disabled', context.guild.id))
 
-        config=lib.get('./settings.json')
+        config=lib.get_config()
         invite_embed=discord.Embed(title='Invite Link', color=652430, url=config.invite_url)
         invite_embed.add_field(name='Click the title for the invite link!', value="Use the Above link to invite the bot to your servers!")
 
@@ -1,4 +1,4 @@
-import discord, lib, pytz
+import discord, lib
 from datetime import datetime, timezone
 from discord.ext import commands
 from structures.user import User
@@ -65,15 +65,15 @@ class MySetting(commands.Cog, CommandWrapper):
 
         # If the setting is timezone convert the value
         if setting == 'timezone':
-            try:
-                timezone = pytz.timezone(value)
-                time = datetime.now(timezone)
-                offset = datetime.now(timezone).strftime('%z')
-                await context.send( lib.get_string('event:timezoneupdated', user.get_guild()).format(value, time.ctime(), offset) )
-            except pytz.exceptions.UnknownTimeZoneError:
+            timezone = lib.get_timezone(value)
+            if timezone is None:
                 await context.send(lib.get_string('mysetting:timezone:help', user.get_guild()))
                 return
 
+            time = datetime.now(timezone)
+            offset = datetime.now(timezone).strftime('%z')
+            await context.send( lib.get_string('event:timezoneupdated', user.get_guild()).format(value, time.ctime(), offset) )
+
         elif setting == 'maxwpm':
             # Must be a number.
             value = lib.is_number(value)
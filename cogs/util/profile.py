@@ -39,19 +39,20 @@ class Profile(commands.Cog, CommandWrapper):
             'yearly_goals_completed': user.get_stat('yearly_goals_completed'),
         }
 
+        strings = lib.strings(user.get_guild())
         embed = discord.Embed(title=user.get_name(), color=3066993)
 
-        embed.add_field(name=lib.get_string('profile:lvlxp', user.get_guild()), value=profile['lvlxp'], inline=True)
-        embed.add_field(name=lib.get_string('profile:words', user.get_guild()), value=profile['words'], inline=True)
-        embed.add_field(name=lib.get_string('profile:wordssprints', user.get_guild()), value=profile['words_sprints'], inline=True)
-        embed.add_field(name=lib.get_string('profile:sprintsstarted', user.get_guild()), value=profile['sprints_started'], inline=True)
-        embed.add_field(name=lib.get_string('profile:sprintscompleted', user.get_guild()), value=profile['sprints_completed'], inline=True)
-        embed.add_field(name=lib.get_string('profile:sprintswon', user.get_guild()), value=profile['sprints_won'], inline=True)
-        embed.add_field(name=lib.get_string('profile:challengescompleted', user.get_guild()), value=profile['challenges_completed'], inline=True)
-        embed.add_field(name=lib.get_string('profile:dailygoalscompleted', user.get_guild()), value=profile['daily_goals_completed'], inline=True)
-        embed.add_field(name=lib.get_string('profile:weeklygoalscompleted', user.get_guild()), value=profile['weekly_goals_completed'], inline=True)
-        embed.add_field(name=lib.get_string('profile:monthlygoalscompleted', user.get_guild()), value=profile['monthly_goals_completed'], inline=True)
-        embed.add_field(name=lib.get_string('profile:yearlygoalscompleted', user.get_guild()), value=profile['yearly_goals_completed'], inline=True)
+        embed.add_field(name=strings['profile:lvlxp'], value=profile['lvlxp'], inline=True)
+        embed.add_field(name=strings['profile:words'], value=profile['words'], inline=True)
+        embed.add_field(name=strings['profile:wordssprints'], value=profile['words_sprints'], inline=True)
+        embed.add_field(name=strings['profile:sprintsstarted'], value=profile['sprints_started'], inline=True)
+        embed.add_field(name=strings['profile:sprintscompleted'], value=profile['sprints_completed'], inline=True)
+        embed.add_field(name=strings['profile:sprintswon'], value=profile['sprints_won'], inline=True)
+        embed.add_field(name=strings['profile:challengescompleted'], value=profile['challenges_completed'], inline=True)
+        embed.add_field(name=strings['profile:dailygoalscompleted'], value=profile['daily_goals_completed'], inline=True)
+        embed.add_field(name=strings['profile:weeklygoalscompleted'], value=profile['weekly_goals_completed'], inline=True)
+        embed.add_field(name=strings['profile:monthlygoalscompleted'], value=profile['monthly_goals_completed'], inline=True)
+        embed.add_field(name=strings['profile:yearlygoalscompleted'], value=profile['yearly_goals_completed'], inline=True)
 
 
         # Send the message
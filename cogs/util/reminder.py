@@ -1,4 +1,4 @@
-import discord, lib, re, pytz, time
+import discord, lib, re, time
 from datetime import datetime, timezone, timedelta
 from discord.ext import commands
 from structures.reminder import Reminder
@@ -108,7 +108,7 @@ class Remind(commands.Cog, CommandWrapper):
             # Now convert the time to an int.
             requested_time = int(requested_time)
 
-            timezone = pytz.timezone(user.get_setting('timezone'))
+            timezone = lib.get_timezone(user.get_setting('timezone'))
             timezone_date = datetime.now(timezone).strftime('%d-%m-%Y') if requested_date is None else requested_date
             timezone_time = int(datetime.now(timezone).strftime('%H%M'))
 
@@ -158,7 +158,7 @@ class Remind(commands.Cog, CommandWrapper):
             # Now convert the time to an int.
             requested_time = int(requested_time)
 
-            timezone = pytz.timezone(user.get_setting('timezone'))
+            timezone = lib.get_timezone(user.get_setting('timezone'))
             timezone_date = datetime.now(timezone).strftime('%d-%m-%Y')
             timezone_time = int(datetime.now(timezone).strftime('%H%M'))
 
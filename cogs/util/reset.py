@@ -1,5 +1,6 @@
 import discord, lib
 from discord.ext import commands
+from structures.db import Database
 from structures.guild import Guild
 from structures.user import User
 from structures.wrapper import CommandWrapper
@@ -55,26 +56,29 @@ class Reset(commands.Cog, CommandWrapper):
             output = 'OK'
             return await context.send(user.get_mention() + ', ' + output)
 
-        # Personal Best
-        if what == 'pb':
-            user.update_record('wpm', 0)
-            output = lib.get_string('reset:pb', user.get_guild())
+        # Make all the changes in one transaction, so a reset is never left half done
+        with Database.instance().transaction():
 
-        elif what == 'wc':
-            user.update_stat('total_words_written', 0)
-            output = lib.get_string('reset:wc', user.get_guild())
+            # Personal Best
+            if what == 'pb':
+                user.update_record('wpm', 0)
+                output = lib.get_string('reset:pb', user.get_guild())
 
-        elif what == 'xp':
-            await user.update_xp(0)
-            output = lib.get_string('reset:xp', user.get_guild())
+            elif what == 'wc':
+                user.update_stat('total_words_written', 0)
+                output = lib.get_string('reset:wc', user.get_guild())
 
-        elif what == 'projects':
-            user.reset_projects()
-            output = lib.get_string('reset:projects', user.get_guild())
+            elif what == 'xp':
+                await user.update_xp(0)
+                output = lib.get_string('reset:xp', user.get_guild())
 
-        elif what == 'all':
-            user.reset()
-            output = lib.get_string('reset:done', user.get_guild())
+            elif what == 'projects':
+                user.reset_projects()
+                output = lib.get_string('reset:projects', user.get_guild())
+
+            elif what == 'all':
+                user.reset()
+                output = lib.get_string('reset:done', user.get_guild())
 
         return await context.send( user.get_mention() + ', ' + output )
 
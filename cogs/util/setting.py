@@ -80,6 +80,15 @@ class Setting(commands.Cog, CommandWrapper):
                 return await context.send(user.get_mention() + ', ' + lib.get_string('setting:disable', guild.get_id()).format(setting, value))
 
         guild.update_setting(setting, value)
+
+        # The language of each guild is kept in memory, so it needs to know this one has changed.
+        if setting == 'lang':
+            lib.invalidate_lang(guild.get_id())
+
+        # So are the prefixes, which are needed for every message.
+        if setting == 'prefix':
+            self.bot.set_prefix(guild.get_id(), value)
+
         return await context.send(user.get_mention() + ', ' + lib.get_string('setting:updated', guild.get_id()).format(setting, value))
 
 def setup(bot):
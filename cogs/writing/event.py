@@ -402,7 +402,7 @@ class EventCommand(commands.Cog, CommandWrapper):
         """
         user = User(context.message.author.id, context.guild.id, context)
         event = Event.get_by_guild(user.get_guild())
-        config = lib.get('./settings.json')
+        config = lib.get_config()
 
         # Make sure there is an event
         if event is None:
@@ -50,7 +50,7 @@ class Wrote(commands.Cog, CommandWrapper):
         shortname = args['shortname']
         message = None
 
-        # If they were writing in a Project, update its word count.
+        project = None
         if shortname is not None:
 
             project = user.get_project(shortname.lower())
@@ -59,25 +59,37 @@ class Wrote(commands.Cog, CommandWrapper):
             if not project:
                 return await context.send(user.get_mention() + ', ' + lib.get_string('project:err:noexists', user.get_guild()).format(shortname))
 
-            project.add_words(amount)
-
             written_stat = user.get_stat('total_words_written')
             if written_stat is None:
                 written_stat = 0
             total = int(written_stat) + int(amount)
 
-            message = lib.get_string('wrote:addedtoproject', user.get_guild()).format(str(amount), project.get_title(), project.get_words(), total)
-
-        # # Is there an Event running?
+        # Is there an Event running?
         event = Event.get_by_guild(user.get_guild())
-        if event and event.is_running():
-            event.add_words(user.get_id(), amount)
 
-        # Increment their words written statistic
-        user.add_stat('total_words_written', amount)
+        # Hold back any goal messages until the words have been saved
+        user.defer_messages()
+
+        # Save all the words in one transaction
+        with self.__db.transaction():
+
+            # If they were writing in a Project, update its word count.
+            if project is not None:
+                project.add_words(amount)
 
-        # Update their words towards their goals
-        await user.add_to_goals(amount)
+            if event and event.is_running():
+                event.add_words(user.get_id(), amount)
+
+            # Increment their words written statistic
+            user.add_stat('total_words_written', amount)
+
+            # Update their words towards their goals
+            await user.add_to_goals(amount)
+
+        await user.send_deferred_messages()
+
+        if project is not None:
+            message = lib.get_string('wrote:addedtoproject', user.get_guild()).format(str(amount), project.get_title(), project.get_words(), total)
 
         # Output message
         if message is None:
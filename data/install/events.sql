@@ -1,7 +1,7 @@
 CREATE TABLE IF NOT EXISTS events (
     id INTEGER PRIMARY KEY auto_increment,
-    guild TEXT NOT NULL,
-    channel TEXT NOT NULL,
+    guild BIGINT UNSIGNED NOT NULL,
+    channel BIGINT UNSIGNED NOT NULL,
     title VARCHAR(255) NOT NULL,
     description TEXT NULL,
     img VARCHAR(255) NULL,
@@ -1,4 +1,4 @@
 CREATE TABLE IF NOT EXISTS guilds (
     id INTEGER PRIMARY KEY auto_increment,
-    guild TEXT NOT NULL
+    guild BIGINT UNSIGNED NOT NULL
 ) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci;
\ No newline at end of file
@@ -1,8 +1,8 @@
 CREATE TABLE IF NOT EXISTS projects (
     id INTEGER PRIMARY KEY auto_increment,
-    user TEXT NOT NULL,
+    user BIGINT UNSIGNED NOT NULL,
     name TEXT NOT NULL,
-    shortname TEXT NOT NULL,
+    shortname VARCHAR(255) NOT NULL,
     words INTEGER DEFAULT 0,
     completed BIGINT DEFAULT 0,
     status VARCHAR(255) DEFAULT 'progress',
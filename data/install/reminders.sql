@@ -1,9 +1,9 @@
 CREATE TABLE IF NOT EXISTS reminders (
     id INTEGER PRIMARY KEY auto_increment,
-    user TEXT NULL,
-    guild TEXT NULL,
+    user BIGINT UNSIGNED NULL,
+    guild BIGINT UNSIGNED NULL,
     time BIGINT NOT NULL,
-    channel TEXT NOT NULL,
+    channel BIGINT UNSIGNED NOT NULL,
     message VARCHAR(255) NOT NULL,
     intervaltime BIGINT NULL
 ) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci;
\ No newline at end of file
@@ -1,12 +1,12 @@
 CREATE TABLE IF NOT EXISTS sprints (
     id INTEGER PRIMARY KEY auto_increment,
-    guild TEXT NOT NULL,
-    channel TEXT NOT NULL,
+    guild BIGINT UNSIGNED NOT NULL,
+    channel BIGINT UNSIGNED NOT NULL,
     start BIGINT NOT NULL,
     end BIGINT NOT NULL,
     end_reference BIGINT NOT NULL,
     length BIGINT NOT NULL,
-    createdby TEXT NOT NULL,
+    createdby BIGINT UNSIGNED NOT NULL,
     created BIGINT NOT NULL,
     completed BIGINT DEFAULT 0
 ) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci;
\ No newline at end of file
@@ -1,6 +1,6 @@
 CREATE TABLE IF NOT EXISTS user_challenges (
     id INTEGER PRIMARY KEY auto_increment,
-    user TEXT NOT NULL,
+    user BIGINT UNSIGNED NOT NULL,
     challenge TEXT NOT NULL,
     completed BIGINT DEFAULT 0,
     xp INTEGER NOT NULL
@@ -1,7 +1,7 @@
 CREATE TABLE IF NOT EXISTS user_goals_history (
     id INTEGER PRIMARY KEY auto_increment,
-    user TEXT NOT NULL,
-    type TEXT NOT NULL,
+    user BIGINT UNSIGNED NOT NULL,
+    type VARCHAR(255) NOT NULL,
     date TEXT NOT NULL,
     goal INTEGER NOT NULL,
     result INTEGER NOT NULL,
@@ -1,7 +1,7 @@
 CREATE TABLE IF NOT EXISTS user_goals (
     id INTEGER PRIMARY KEY auto_increment,
-    user TEXT NOT NULL,
-    type TEXT NOT NULL,
+    user BIGINT UNSIGNED NOT NULL,
+    type VARCHAR(255) NOT NULL,
     goal INTEGER NOT NULL,
     current INTEGER NOT NULL,
     completed BOOLEAN NOT NULL,
@@ -1,7 +1,7 @@
 CREATE TABLE IF NOT EXISTS user_settings (
     id INTEGER PRIMARY KEY auto_increment,
-    user TEXT NOT NULL,
-    guild TEXT NULL,
-    setting TEXT NOT NULL,
+    user BIGINT UNSIGNED NOT NULL,
+    guild BIGINT UNSIGNED NULL,
+    setting VARCHAR(255) NOT NULL,
     value TEXT NOT NULL
 ) CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci;
\ No newline at end of file
@@ -1,15 +1,50 @@
-import json, math, os, pytz, random, string
-from collections import namedtuple
+import json, logging, math, os, pytz, random, string
+from collections import namedtuple, OrderedDict
 from pprint import pprint
-from functools import lru_cache
+from types import MappingProxyType
 from os import path
-from datetime import datetime, timezone, timedelta, time
+from datetime import datetime, timezone, timedelta
+from time import monotonic
 from dateutil import relativedelta
-from structures.db import Database
+import structures.db
+from structures.logger import Logger
+
+# orjson parses a lot faster than the json module, so use it if it's installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Discord has a maximum of 2000 characters per message
 MAXIMUM_MESSAGE_CHARACTER_LIMIT = 2000
 
+# The namedtuple classes made by `get`, keyed by their fields, so each shape of JSON object only makes its class once.
+_record_types = {}
+
+def _to_record(d):
+    """
+    Convert a decoded JSON object into a namedtuple, with a cached class for its fields
+    @param d: dict
+    @return namedtuple
+    """
+    fields = tuple(d)
+    record_type = _record_types.get(fields)
+    if record_type is None:
+        record_type = _record_types[fields] = namedtuple('X', fields)
+    return record_type(*d.values())
+
+def _to_records(value):
+    """
+    Convert all the objects in a decoded JSON value into namedtuples, from the inside out like an object_hook would
+    @param value:
+    @return:
+    """
+    if isinstance(value, dict):
+        return _to_record({key: _to_records(item) for key, item in value.items()})
+    elif isinstance(value, list):
+        return [_to_records(item) for item in value]
+    return value
+
 def get(file,as_object=True):
     """
     Load a JSON file and return the contents as an object or array
@@ -17,25 +52,105 @@ def get(file,as_object=True):
     @param as_object: Return as an object (can be accessed via object.property). Otherwise object['property'].
     @return object
     """
+    if orjson is not None:
+        with open(file, 'rb') as data:
+            result = orjson.loads(data.read())
+        return _to_records(result) if as_object else result
+
     with open(file, 'r') as data:
         if as_object:
-            return json.load(data, object_hook=lambda d: namedtuple('X', d.keys())(*d.values()))
+            return json.load(data, object_hook=_to_record)
         else:
             return json.load(data)
 
+# The bot's settings, which are read from settings.json the first time they are needed and then shared, rather than
+# parsing the file again every time. `reload_config` reads it again, e.g. after changing the file.
+CONFIG_FILE = path.join(path.dirname(path.abspath(__file__)), 'settings.json')
+_config = None
+
+def get_config():
+    """
+    Get the bot's settings
+    @return object
+    """
+    if _config is None:
+        return reload_config()
+    return _config
+
+def reload_config():
+    """
+    Read the bot's settings from settings.json again
+    @return object
+    """
+    global _config
+    _config = get(CONFIG_FILE)
+
+    # The logger is configured from here, rather than reading the settings itself, so it can log without them
+    Logger.instance().configure(_config)
+
+    return _config
+
+# Language of each guild, so we don't have to query guild_settings for every string.
+# This is loaded with one query the first time it's used. Guilds which aren't in it use the default language, and
+# guilds whose language has changed are set to None, so they are loaded again next time.
+DEFAULT_LANG = 'en'
+_guild_langs = None
+_guild_lang_stats = {'hits': 0, 'misses': 0}
+
+def load_langs():
+    """
+    Load the language setting of every guild into the guild language map
+    :return: int Number of guilds with a language set
+    """
+    global _guild_langs
+
+    db = structures.db.Database.instance()
+    langs = {}
+    for row in db.get_all('guild_settings', {'setting': 'lang'}):
+        langs[int(row['guild'])] = row['value'] if is_supported_language(row['value']) else DEFAULT_LANG
+
+    _guild_langs = langs
+    return len(langs)
+
+def invalidate_lang(guild_id):
+    """
+    Mark a guild's language as changed, so it is loaded from the database the next time it's needed
+    :param guild_id:
+    :return:
+    """
+    if _guild_langs is not None:
+        _guild_langs[int(guild_id)] = None
+
+def get_lang_stats():
+    """
+    Get the hit/miss counters of the guild language map
+    :return: dict
+    """
+    return dict(_guild_lang_stats, guilds=len(_guild_langs) if _guild_langs is not None else 0)
+
 def get_lang(guild_id):
     """
     Check which language file the guild is using
     @param guild_id: The guild ID
     @return string: The language code
     """
-    db = Database.instance()
+    if _guild_langs is None:
+        load_langs()
+
+    guild_id = int(guild_id) if guild_id else 0
+    lang = _guild_langs.get(guild_id, DEFAULT_LANG)
+    if lang is not None:
+        _guild_lang_stats['hits'] += 1
+        return lang
+
+    # It has been changed since we loaded it, so we need to get it again.
+    _guild_lang_stats['misses'] += 1
+    db = structures.db.Database.instance()
     result = db.get('guild_settings', {'guild': guild_id, 'setting': 'lang'})
 
-    if result and is_supported_language(result['value']):
-        return result['value']
-    else:
-        return 'en'
+    lang = result['value'] if result and is_supported_language(result['value']) else DEFAULT_LANG
+    _guild_langs[guild_id] = lang
+    return lang
 
 def get_supported_languages():
     """
@@ -73,33 +188,157 @@ def get_string(str, guild_id):
     lang = get_lang(guild_id)
     return _get_translated_string(str, lang)
 
-@lru_cache(maxsize=1024)
+# The strings of each language, loaded from data/lang/ once and then never changed, only replaced by a reload.
+_catalogs = None
+
+def load_catalogs():
+    """
+    Load all the language catalogs, filling in any strings missing from a language with the default language's.
+    They are all swapped in at once, so this can be used to reload them while the bot is running.
+    :return: int Number of catalogs loaded
+    """
+    global _catalogs
+
+    strings = {}
+    for file in os.listdir('./data/lang/'):
+        if file.endswith('.json'):
+            strings[file[:-5]] = get('./data/lang/' + file, False)
+
+    default = strings.get(DEFAULT_LANG, {})
+    _catalogs = {lang: MappingProxyType(dict(default, **catalog)) for lang, catalog in strings.items()}
+    return len(_catalogs)
+
+def _get_catalog(lang):
+    """
+    Get the catalog of strings for a language, or the default language if we don't have that one
+    :param lang:
+    :return: MappingProxyType
+    """
+    if _catalogs is None:
+        load_catalogs()
+
+    return _catalogs.get(lang, _catalogs[DEFAULT_LANG])
+
 def _get_translated_string(str, lang):
-    out("Fetching translation for " + str + " in " + lang)
+    """
+    Get a string from the catalog of a language
+    :param str:
+    :param lang:
+    :return:
+    """
+    catalog = _get_catalog(lang)
+    return catalog[str] if str in catalog else f'[[{str}]]'
+
+def strings(guild_id):
+    """
+    Get the strings in the guild's language, for commands which need a lot of them, so the language is only looked up once.
+    e.g. `strings = lib.strings(guild_id)` then `strings['help:about']` or `strings.get('admin:reload', count)` to format it
+    :param guild_id:
+    :return: StringBundle
+    """
+    return StringBundle(get_lang(guild_id))
+
+class StringBundle:
+    """
+    The strings of one language, accessed by key, e.g. `strings['sprint:results:header']`
+    """
+
+    def __init__(self, lang):
+        self.lang = lang
+        self.__catalog = _get_catalog(lang)
+
+    def __getitem__(self, key):
+        return self.__catalog[key] if key in self.__catalog else f'[[{key}]]'
+
+    def get(self, key, *args):
+        """
+        Get a string, formatted with the arguments
+        :param key:
+        :param args:
+        :return: string
+        """
+        return self[key].format(*args) if args else self[key]
+
+# Parsed asset files, keyed by (language, asset), with the least recently used first.
+# Each one is checked for changes at most every ASSET_REVALIDATE_SECONDS, and the least recently used ones are dropped
+# once the total size of their files goes over ASSET_CACHE_BUDGET.
+ASSET_REVALIDATE_SECONDS = 30
+ASSET_CACHE_BUDGET = 16 * 1024 * 1024 # Bytes
+_assets = OrderedDict()
+_asset_stats = {'hits': 0, 'misses': 0, 'reloads': 0, 'evictions': 0, 'size': 0}
 
-    path = f'./data/lang/{lang}.json'
-    strings = get(path, False)
-    return strings[str] if str in strings else f'[[{str}]]'
+def _get_asset_file(asset, lang):
+    """
+    Get the path of an asset file in a language, or in 'en' if there isn't one in that language
+    :param asset:
+    :param lang:
+    :return: string
+    """
+    file = './assets/json/' + lang + '/' + asset + '.json'
+    return file if path.exists(file) else './assets/json/en/' + asset + '.json'
 
 def get_asset(asset, guild_id):
     """
-    Load a JSON asset file, in the language of the guild_id
+    Load a JSON asset file, in the language of the guild_id.
+    The parsed asset is cached and shared between calls, so it must not be changed.
     :param asset:
     :param guild_id:
     :return:
     """
+    key = (get_lang(guild_id), asset)
+    now = monotonic()
+
+    entry = _assets.get(key)
+    if entry is not None:
+
+        # If we checked the file recently, we can just use it. Otherwise make sure it hasn't changed.
+        if now - entry['checked'] < ASSET_REVALIDATE_SECONDS:
+            _asset_stats['hits'] += 1
+            _assets.move_to_end(key)
+            return entry['data']
 
-    file = './assets/json/' + get_lang(guild_id) + '/' + asset + '.json'
+        file = _get_asset_file(asset, key[0])
+        try:
+            if file == entry['file'] and os.stat(file).st_mtime == entry['mtime']:
+                entry['checked'] = now
+                _asset_stats['hits'] += 1
+                _assets.move_to_end(key)
+                return entry['data']
+        except FileNotFoundError:
+            pass
+
+        _asset_stats['reloads'] += 1
+        _asset_stats['size'] -= entry['size']
+        del _assets[key]
+
+    _asset_stats['misses'] += 1
 
     # Try and get the file in the server's language first. If not, default to 'en'
+    file = _get_asset_file(asset, key[0])
     try:
-        if path.exists(file):
-            return get(file, False)
-        else:
-            return get('./assets/json/en/' + asset + '.json', False)
+        stat = os.stat(file)
+        data = get(file, False)
     except FileNotFoundError:
         return False
 
+    _assets[key] = {'data': data, 'file': file, 'mtime': stat.st_mtime, 'size': stat.st_size, 'checked': now}
+    _asset_stats['size'] += stat.st_size
+
+    # Drop the least recently used assets if we are over budget, but always keep the one we just loaded.
+    while _asset_stats['size'] > ASSET_CACHE_BUDGET and len(_assets) > 1:
+        evicted_key, evicted = _assets.popitem(last=False)
+        _asset_stats['size'] -= evicted['size']
+        _asset_stats['evictions'] += 1
+
+    return data
+
+def get_asset_stats():
+    """
+    Get the hit/miss counters and size of the asset cache
+    :return: dict
+    """
+    return dict(_asset_stats, assets=len(_assets))
+
 
 def find_in_array(lst, key, value):
     """
@@ -130,17 +369,30 @@ def is_number(value):
     except (ValueError, TypeError):
         return False
 
+# Every timezone name in lowercase, mapped to its proper name, so they can be looked up without caring about case.
+_timezone_names = {name.lower(): name for name in pytz.all_timezones}
+
+# pytz timezone objects which have already been loaded, keyed by their proper name.
+_timezones = {}
+
+def get_timezone_name(timezone):
+    """
+    Get the proper name of a timezone, e.g. 'europe/london' => 'Europe/London'
+    @param timezone:
+    @return: string, or None if it is not a valid timezone
+    """
+    if not timezone:
+        return None
+
+    return _timezone_names.get(timezone.lower())
+
 def is_valid_timezone(timezone):
     """
     Check if the timezone string is valid
     @param timezone:
     @return:
     """
-    if not timezone:
-        return False
-
-    timezones = [x.lower() for x in pytz.all_timezones]
-    return timezone.lower() in timezones
+    return get_timezone_name(timezone) is not None
 
 def get_timezone(timezone):
     """
@@ -148,7 +400,15 @@ def get_timezone(timezone):
     @param timezone:
     @return:
     """
-    return pytz.timezone(timezone) if is_valid_timezone(timezone) else None
+    name = get_timezone_name(timezone)
+    if name is None:
+        return None
+
+    tz = _timezones.get(name)
+    if tz is None:
+        tz = _timezones[name] = pytz.timezone(name)
+
+    return tz
 
 def get_midnight_utc(timezone, type):
     """
@@ -160,7 +420,10 @@ def get_midnight_utc(timezone, type):
     :return:
     """
 
-    tz = pytz.timezone(timezone)
+    tz = get_timezone(timezone)
+    if tz is None:
+        raise pytz.exceptions.UnknownTimeZoneError(timezone)
+
     today = datetime.now(tz)
 
     if type == "daily":
@@ -189,7 +452,10 @@ def get_previous_date(timezone, type):
     @param type:
     @return:
     """
-    tz = pytz.timezone(timezone)
+    tz = get_timezone(timezone)
+    if tz is None:
+        raise pytz.exceptions.UnknownTimeZoneError(timezone)
+
     today = datetime.now(tz)
 
     if type == "daily":
@@ -211,6 +477,24 @@ def get_previous_date(timezone, type):
 
     return date
 
+def get_goal_resets(goals):
+    """
+    Work out the next reset time and the previous goal's date for each (timezone, type) of goal.
+    Users are mostly in the same few timezones, so resetting goals in bulk only needs them calculating once per
+    timezone, instead of once per user.
+    @param goals: iterable of (timezone, type)
+    @return: dict of (timezone, type) => (reset, date). Invalid timezones are left out.
+    """
+    resets = {}
+    for timezone, type in set(goals):
+
+        if get_timezone(timezone) is None:
+            continue
+
+        resets[(timezone, type)] = (get_midnight_utc(timezone, type), get_previous_date(timezone, type))
+
+    return resets
+
 def secs_to_mins(seconds):
     """
     Convert a number of seconds, into minutes and seconds
@@ -299,8 +583,7 @@ def out(txt):
     :param txt:
     :return:
     """
-    time = datetime.now().strftime("%Y-%m-%d, %H:%M:%S")
-    print('['+str(time)+']' + str(txt))
+    Logger.instance().log(logging.INFO, str(txt))
 
 def debug(txt):
     """
@@ -308,8 +591,7 @@ def debug(txt):
     :param txt:
     :return:
     """
-    time = datetime.now().strftime("%Y-%m-%d, %H:%M:%S")
-    print('['+str(time)+'][DEBUG] ' + str(txt))
+    Logger.instance().log(logging.DEBUG, '[DEBUG] ' + str(txt))
 
 def generate_error_code():
     """
@@ -330,10 +612,6 @@ def error(txt, use_code=None):
     :param txt:
     :return:
     """
-    time = datetime.now().strftime("%Y-%m-%d, %H:%M:%S")
     code = generate_error_code() if use_code is None else use_code
-
-    file = open('logs/error.log', 'a')
-    file.write('['+str(time)+'][ERROR]['+code+'] ' + str(txt) + '\n')
-    file.close()
+    Logger.instance().log(logging.ERROR, '[ERROR][' + code + '] ' + str(txt))
     return code
@@ -4,7 +4,7 @@ from bot import WriterBot
 from discord.ext import commands
 
 # Load the settings for initial setup
-config = lib.get('./settings.json')
+config = lib.get_config()
 
 # Load the Bot object
 status = discord.Game( 'Booting up...' )
@@ -0,0 +1,252 @@
+import json, mmap, os, re, struct
+from time import monotonic
+
+# Compact binary version of the gen_* assets, which is memory-mapped instead of parsed, so every shard process on the
+# host shares the same pages instead of holding its own copy of the JSON.
+#
+# Layout (all integers are little endian):
+#   header      magic, version, slot count, format count, token count, string count
+#   slots       (first string, string count) for each slot, as its choices are stored next to each other
+#   formats     (first token, token count) for each format
+#   tokens      int32 for each token: >= 0 is the slot to fill in, < 0 is -(string + 1) for a literal string
+#   offsets     uint32 offset of each string in the string data, plus the end of the last one
+#   strings     utf-8 string data
+
+MAGIC = b'WBAP'
+VERSION = 1
+HEADER = struct.Struct('<4sIIIII')
+PAIR = struct.Struct('<II')
+TOKEN = struct.Struct('<i')
+OFFSET = struct.Struct('<I')
+
+SOURCE_PATH = './assets/json'
+PACK_PATH = './assets/bin'
+REVALIDATE_SECONDS = 30
+
+SLOT = re.compile(r"\$([a-z0-9]+)")
+
+# (lang, asset) => (AssetPack or None, when we last checked the files)
+_packs = {}
+
+def build(source_file, pack_file):
+    """
+    Convert a gen_* JSON asset into an asset pack
+    :param source_file:
+    :param pack_file:
+    :return:
+    """
+    with open(source_file, 'r', encoding='utf-8') as file:
+        source = json.load(file)
+
+    strings = []
+    slots = []
+    index = {}
+
+    # Each slot's choices go next to each other in the string table, so a slot is just a range of it
+    for name, choices in source['names'].items():
+        index[name] = len(slots)
+        slots.append((len(strings), len(choices)))
+        strings.extend(choices)
+
+    literals = {}
+    formats = []
+    tokens = []
+
+    for format in source['formats']:
+
+        first = len(tokens)
+        position = 0
+        for match in SLOT.finditer(format):
+
+            if match.start() > position:
+                tokens.append(_literal(format[position:match.start()], strings, literals))
+
+            # Slots which aren't in the asset just come out as their name, without the $
+            name = match.group(1)
+            tokens.append(index[name] if name in index else _literal(name, strings, literals))
+            position = match.end()
+
+        if position < len(format):
+            tokens.append(_literal(format[position:], strings, literals))
+
+        formats.append((first, len(tokens) - first))
+
+    data = [string.encode('utf-8') for string in strings]
+    offsets = [0]
+    for encoded in data:
+        offsets.append(offsets[-1] + len(encoded))
+
+    # Write it to a temporary file and move it into place, so a process reading the old pack is never left with half a file
+    os.makedirs(os.path.dirname(pack_file), exist_ok=True)
+    tmp_file = pack_file + '.' + str(os.getpid()) + '.tmp'
+    with open(tmp_file, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(slots), len(formats), len(tokens), len(strings)))
+        file.writelines(PAIR.pack(*slot) for slot in slots)
+        file.writelines(PAIR.pack(*format) for format in formats)
+        file.writelines(TOKEN.pack(token) for token in tokens)
+        file.writelines(OFFSET.pack(offset) for offset in offsets)
+        file.writelines(data)
+
+    os.replace(tmp_file, pack_file)
+
+def _literal(string, strings, literals):
+    """
+    Get the token for a literal string, adding it to the string table if it isn't already there
+    :param string:
+    :param strings:
+    :param literals:
+    :return: int
+    """
+    if string not in literals:
+        literals[string] = len(strings)
+        strings.append(string)
+    return -(literals[string] + 1)
+
+def get_pack_file(source_file):
+    """
+    Get the path of the asset pack for a JSON asset file
+    :param source_file:
+    :return: string
+    """
+    relative = os.path.relpath(source_file, SOURCE_PATH)
+    return os.path.join(PACK_PATH, os.path.splitext(relative)[0] + '.bin')
+
+def is_current(source_file, pack_file):
+    """
+    Check if an asset pack exists and was built since its JSON asset was last changed
+    :param source_file:
+    :param pack_file:
+    :return: bool
+    """
+    try:
+        return os.stat(pack_file).st_mtime >= os.stat(source_file).st_mtime
+    except FileNotFoundError:
+        return False
+
+def build_all():
+    """
+    Build the asset packs for all of the gen_* assets which don't have an up to date one
+    :return: int Number of packs built
+    """
+    built = 0
+    for lang in sorted(os.listdir(SOURCE_PATH)):
+
+        directory = os.path.join(SOURCE_PATH, lang)
+        for asset in sorted(os.listdir(directory)):
+
+            if not asset.startswith('gen_') or not asset.endswith('.json'):
+                continue
+
+            source_file = os.path.join(directory, asset)
+            pack_file = get_pack_file(source_file)
+            if not is_current(source_file, pack_file):
+                build(source_file, pack_file)
+                built += 1
+
+    return built
+
+def get_pack(asset, lang):
+    """
+    Get the asset pack of an asset in a language (or in 'en' if there isn't one in that language)
+    :param asset:
+    :param lang:
+    :return: AssetPack, or None if there isn't an up to date pack, in which case the JSON asset should be used
+    """
+    key = (lang, asset)
+    now = monotonic()
+
+    cached = _packs.get(key)
+    if cached is not None and now - cached[1] < REVALIDATE_SECONDS:
+        return cached[0]
+
+    source_file = os.path.join(SOURCE_PATH, lang, asset + '.json')
+    if not os.path.exists(source_file):
+        source_file = os.path.join(SOURCE_PATH, 'en', asset + '.json')
+
+    pack_file = get_pack_file(source_file)
+    pack = cached[0] if cached is not None else None
+
+    if not is_current(source_file, pack_file):
+        pack = None
+    elif pack is None or pack.mtime != os.stat(pack_file).st_mtime:
+        pack = AssetPack(pack_file)
+
+    _packs[key] = (pack, now)
+    return pack
+
+class StringList:
+    """
+    A slot's choices in an asset pack, which are only decoded when they are chosen
+    """
+
+    def __init__(self, pack, first, count):
+        self.pack = pack
+        self.first = first
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        return self.pack.get_string(self.first + i)
+
+class AssetPack:
+    """
+    A memory-mapped asset pack
+    """
+
+    def __init__(self, file):
+
+        self.file = file
+        self.mtime = os.stat(file).st_mtime
+
+        with open(file, 'rb') as handle:
+            self.__map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, slot_count, format_count, token_count, string_count = HEADER.unpack_from(self.__map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('Invalid asset pack: ' + file)
+
+        # Work out where each section starts
+        self.__slots = HEADER.size
+        self.__formats = self.__slots + PAIR.size * slot_count
+        self.__tokens = self.__formats + PAIR.size * format_count
+        self.__offsets = self.__tokens + TOKEN.size * token_count
+        self.__strings = self.__offsets + OFFSET.size * (string_count + 1)
+
+        self.slots = [StringList(self, *PAIR.unpack_from(self.__map, self.__slots + PAIR.size * i)) for i in range(slot_count)]
+        self.format_count = format_count
+
+    def get_string(self, i):
+        """
+        Decode one string from the string table
+        :param i:
+        :return: string
+        """
+        start, end = PAIR.unpack_from(self.__map, self.__offsets + OFFSET.size * i)
+        return self.__map[self.__strings + start:self.__strings + end].decode('utf-8')
+
+    def get_formats(self):
+        """
+        Get the formats as lists of tokens, the same as Grammar.formats: either a literal string or the index of a slot
+        :return: list
+        """
+        formats = []
+        for i in range(self.format_count):
+
+            first, count = PAIR.unpack_from(self.__map, self.__formats + PAIR.size * i)
+            tokens = []
+            for t in range(first, first + count):
+                token = TOKEN.unpack_from(self.__map, self.__tokens + TOKEN.size * t)[0]
+                tokens.append(token if token >= 0 else self.get_string(-token - 1))
+
+            formats.append(tokens)
+
+        return formats
+
+if __name__ == '__main__':
+
+    # Run from the root directory: `python -m structures.assetpack`
+    print('Built {} asset packs'.format(build_all()))
@@ -0,0 +1,188 @@
+import lib, threading, time
+from collections import OrderedDict
+from structures.singleton import Singleton
+
+# Returned by RowCache.get when there is nothing cached, as None can be a cached result
+MISSING = object()
+
+def _matches(where, row):
+    """
+    Check if a row could match a WHERE clause. Columns we don't know the value of could be anything, so they match.
+    Values are compared as strings, as settings can be written as ints and read back as strings.
+    :param where: dict
+    :param row: dict of the column values we know
+    :return: bool
+    """
+    for column, value in where.items():
+        if column in row and str(row[column]) != str(value):
+            return False
+    return True
+
+def _rows(result):
+    """
+    Get the rows of a cached result, which is either a list of rows (get_all) or one row/None (get)
+    :param result:
+    :return: list
+    """
+    if result is None:
+        return []
+    return result if isinstance(result, list) else [result]
+
+def _copy(result):
+    """
+    Copy a result, so callers can't change what is in the cache
+    :param result:
+    :return:
+    """
+    if isinstance(result, list):
+        return [dict(row) for row in result]
+    return dict(result) if result is not None else None
+
+@Singleton
+class RowCache:
+    """
+    Bounded LRU cache of get/get_all results, with a TTL, for tables which are read far more often than written (the
+    settings tables by default). Entries are keyed by the query, and writes to a table only remove the entries whose
+    WHERE clause could include the rows being written.
+    """
+
+    DEFAULT_SIZE = 2048
+    DEFAULT_TTL = 300 # Seconds
+    DEFAULT_TABLES = ['guild_settings', 'user_settings']
+
+    def __init__(self):
+
+        config = lib.get_config()
+        self.tables = set(getattr(config, 'db_cache_tables', self.DEFAULT_TABLES))
+        self.size = int(getattr(config, 'db_cache_size', self.DEFAULT_SIZE))
+        self.ttl = int(getattr(config, 'db_cache_ttl', self.DEFAULT_TTL))
+
+        # Results can be read and written from the offload/pool worker threads, as well as the event loop
+        self.__lock = threading.Lock()
+
+        # key => (expires, table, where, result), with the least recently used first
+        self.__entries = OrderedDict()
+
+        # Incremented on every write to a table, so a result read before the write is never cached after it
+        self.__generations = {}
+        self.__stats = {'hits': 0, 'misses': 0, 'invalidations': 0, 'evictions': 0}
+
+    def is_cached(self, table):
+        return table in self.tables
+
+    @staticmethod
+    def key(table, where, fields, sort, limit, one):
+        """
+        Get the cache key for a get/get_all query
+        :return: tuple
+        """
+        if isinstance(fields, str):
+            fields = [fields]
+
+        return (table, one, tuple(fields), tuple(where.items()) if where else (), tuple(sort) if sort else None, limit)
+
+    def get(self, key):
+        """
+        Get a cached result
+        :param key:
+        :return: The result, or MISSING if there isn't one (or it has expired)
+        """
+        with self.__lock:
+
+            entry = self.__entries.get(key)
+            if entry is None or entry[0] < time.time():
+                self.__stats['misses'] += 1
+                return MISSING
+
+            self.__entries.move_to_end(key)
+            self.__stats['hits'] += 1
+            return _copy(entry[3])
+
+    def get_generation(self, table):
+        """
+        Get the write generation of a table, to pass to `set` once the query has been run
+        :param table:
+        :return: int
+        """
+        return self.__generations.get(table, 0)
+
+    def set(self, key, table, where, result, generation):
+        """
+        Cache a result, removing the least recently used one if we are full
+        :param key:
+        :param table:
+        :param where:
+        :param result:
+        :param generation: The table's generation from before the query was run
+        :return:
+        """
+        with self.__lock:
+
+            # If the table was written to while we were running the query, the result might already be out of date
+            if self.__generations.get(table, 0) != generation:
+                return
+
+            self.__entries[key] = (time.time() + self.ttl, table, dict(where or {}), _copy(result))
+            self.__entries.move_to_end(key)
+
+            while len(self.__entries) > self.size:
+                self.__entries.popitem(last=False)
+                self.__stats['evictions'] += 1
+
+    def invalidate(self, table, where=None, values=None):
+        """
+        Remove the cached results which could include the rows being written.
+        e.g. for an update, `where` is the update's WHERE clause and `values` are the new column values.
+        :param table:
+        :param where: dict of the columns the written rows had before (None for an insert)
+        :param values: dict of the columns the written rows have after (None for a delete)
+        :return:
+        """
+        with self.__lock:
+
+            self.__generations[table] = self.__generations.get(table, 0) + 1
+            entries = [(key, entry) for key, entry in self.__entries.items() if entry[1] == table]
+
+            # If we are writing by ID, we might know the rest of the row's columns from one of the cached results
+            before = dict(where or {})
+            if 'id' in before:
+                for key, entry in entries:
+                    row = next((row for row in _rows(entry[3]) if str(row.get('id')) == str(before['id'])), None)
+                    if row is not None:
+                        before = dict(row, **before)
+                        break
+
+            after = dict(before, **values) if values is not None else None
+
+            for key, entry in entries:
+                if (where is not None and _matches(entry[2], before)) or (after is not None and _matches(entry[2], after)):
+                    del self.__entries[key]
+                    self.__stats['invalidations'] += 1
+
+    def clear(self, table=None):
+        """
+        Remove all the cached results for a table, or everything
+        :param table:
+        :return:
+        """
+        with self.__lock:
+
+            for cached in (self.tables if table is None else [table]):
+                self.__generations[cached] = self.__generations.get(cached, 0) + 1
+
+            for key in [key for key, entry in self.__entries.items() if table is None or entry[1] == table]:
+                del self.__entries[key]
+                self.__stats['invalidations'] += 1
+
+    def get_stats(self):
+        """
+        Get the hit/miss counters
+        :return: dict
+        """
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats['entries'] = len(self.__entries)
+
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
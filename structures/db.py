@@ -1,26 +1,611 @@
-import sys, os, lib, pymysql, warnings
+import asyncio, contextlib, contextvars, functools, hashlib, sys, os, lib, re, threading, time, warnings
+from concurrent.futures import ThreadPoolExecutor
+from structures import sqlite
+from structures.cache import MISSING, RowCache
+from structures.querystats import QueryStats, get_caller, parse_sql
 from structures.singleton import Singleton
 
 # sys.path.append(os.path.abspath('../'))
 
+# pymysql is only needed for the MySQL engine, so SQLite deployments can run without it
+try:
+    import pymysql
+except ImportError:
+    pymysql = None
+
+# Errors which mean a pooled connection is broken and should be dropped rather than reused
+CONNECTION_ERRORS = (pymysql.err.OperationalError, pymysql.err.InterfaceError) if pymysql else ()
+
+# Valid identifiers for tables/columns, SELECT fields (columns, `*` or simple aggregates like `SUM(words) as total`)
+# and ORDER BY clauses. These are checked once, when a statement template is first compiled.
+IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+FIELD = re.compile(r'^(\*|[A-Za-z_][A-Za-z0-9_]*|[A-Za-z_]+\((\*|[A-Za-z_][A-Za-z0-9_]*)\)(\s+[Aa][Ss]\s+[A-Za-z_][A-Za-z0-9_]*)?)$')
+SORT = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*(\s+(ASC|DESC|asc|desc))?$')
+
+# The cursor of the transaction the current task is running in (if any). Being a context variable, each command or
+# scheduled task has its own, so one transaction never picks up another command's queries.
+_transaction = contextvars.ContextVar('db_transaction', default=None)
+_pool_transaction = contextvars.ContextVar('db_pool_transaction', default=None)
+
+# Cached tables written to in the current transaction, which are cleared from the row cache again once it has finished
+_transaction_writes = contextvars.ContextVar('db_transaction_writes', default=None)
+
+# Maximum number of compiled statement templates to keep. There are only as many as there are distinct call sites.
+TEMPLATE_CACHE_SIZE = 1024
+
+ALL_FIELDS = ['*']
+
+# Where the database is stored when using the SQLite engine, if db_path isn't set
+DEFAULT_SQLITE_PATH = 'data/writerbot.db'
+
+def _validate(pattern, values, type):
+    """
+    Make sure each of the values matches the pattern, as they are going to be put into the SQL directly
+    :param pattern:
+    :param values:
+    :param type: What the values are, for the error message
+    :return:
+    """
+    for value in values:
+        if not isinstance(value, str) or not pattern.match(value):
+            raise ValueError('Invalid SQL ' + type + ': ' + repr(value))
+
+@functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _compile_select_all(table, where):
+    """
+    Compile the SQL for a plain SELECT * statement, from the table and the WHERE keys
+    :return: string
+    """
+    return _compile_get(table, ('*',), where, None, None)
+
+@functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _compile_get(table, fields, where, sort, limit):
+    """
+    Compile the SQL for a SELECT statement, from the table, the field names and the WHERE keys
+    :return: string
+    """
+    _validate(IDENTIFIER, [table], 'table')
+    _validate(FIELD, fields, 'field')
+
+    sql = 'SELECT ' + ', '.join(fields) + ' FROM ' + table
+
+    # Did we specify some WHERE clauses?
+    if where:
+        _validate(IDENTIFIER, where, 'column')
+        sql += ' WHERE ' + ' AND '.join(field + ' = %s' for field in where)
+
+    # Did we specify some sorting?
+    if sort is not None:
+        _validate(SORT, sort, 'sort')
+        sql += ' ORDER BY ' + ', '.join(sort)
+
+    # Is there a limit?
+    if limit is not None:
+        sql += ' LIMIT ' + str(int(limit))
+
+    return sql
+
+@functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _compile_insert(table, fields):
+    """
+    Compile the SQL for an INSERT statement
+    :return: string
+    """
+    _validate(IDENTIFIER, [table], 'table')
+    _validate(IDENTIFIER, fields, 'column')
+
+    # Create param placeholders to be used in the query
+    placeholders = ['%s'] * len(fields)
+    return 'INSERT INTO ' + table + ' (' + ','.join(fields) + ') VALUES (' + ','.join(placeholders) + ')'
+
+@functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _compile_delete(table, where):
+    """
+    Compile the SQL for a DELETE statement
+    :return: string
+    """
+    _validate(IDENTIFIER, [table], 'table')
+    _validate(IDENTIFIER, where, 'column')
+
+    # Never build a DELETE without a WHERE clause, that would empty the whole table.
+    if not where:
+        raise ValueError('Cannot DELETE from ' + table + ' without any WHERE clauses')
+
+    return 'DELETE FROM ' + table + ' WHERE ' + ' AND '.join(field + ' = %s' for field in where)
+
+@functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _compile_update(table, fields, where):
+    """
+    Compile the SQL for an UPDATE statement
+    :return: string
+    """
+    _validate(IDENTIFIER, [table], 'table')
+    _validate(IDENTIFIER, fields, 'column')
+
+    sql = 'UPDATE ' + table + ' SET ' + ', '.join(field + ' = %s' for field in fields)
+
+    # Where clauses
+    if where:
+        _validate(IDENTIFIER, where, 'column')
+        sql += ' WHERE ' + ' AND '.join(field + ' = %s' for field in where)
+
+    return sql
+
+@functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _compile_increment(table, column, where, defaults, minimum):
+    """
+    Compile the SQL for an atomic increment, as an INSERT ... ON DUPLICATE KEY UPDATE statement.
+    The WHERE keys must make up a unique key on the table, for the duplicate key to be hit.
+    :return: string
+    """
+    _validate(IDENTIFIER, [table], 'table')
+    _validate(IDENTIFIER, (column,) + where + defaults, 'column')
+
+    fields = where + (column,) + defaults
+    placeholders = ['%s'] * len(fields)
+
+    # If there is a minimum, we don't let the value go below it.
+    expression = column + ' + %s'
+    if minimum is not None:
+        expression = 'GREATEST(' + expression + ', ' + str(int(minimum)) + ')'
+
+    return 'INSERT INTO ' + table + ' (' + ','.join(fields) + ') VALUES (' + ','.join(placeholders) + ') ' \
+           'ON DUPLICATE KEY UPDATE ' + column + ' = ' + expression
+
+@functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _compile_insert_many(table, fields, count, update):
+    """
+    Compile the SQL for a multi-row INSERT statement, optionally updating the `update` fields on duplicate keys
+    :return: string
+    """
+    _validate(IDENTIFIER, [table], 'table')
+    _validate(IDENTIFIER, fields, 'column')
+
+    row = '(' + ','.join(['%s'] * len(fields)) + ')'
+    sql = 'INSERT INTO ' + table + ' (' + ','.join(fields) + ') VALUES ' + ','.join([row] * count)
+
+    if update:
+        _validate(IDENTIFIER, update, 'column')
+        sql += ' ON DUPLICATE KEY UPDATE ' + ', '.join(field + ' = VALUES(' + field + ')' for field in update)
+
+    return sql
+
+@functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _compile_delete_many(table, column, count):
+    """
+    Compile the SQL for a DELETE statement matching a list of values
+    :return: string
+    """
+    _validate(IDENTIFIER, [table, column], 'column')
+    return 'DELETE FROM ' + table + ' WHERE ' + column + ' IN (' + ','.join(['%s'] * count) + ')'
+
+def _chunks(rows, size):
+    """
+    Split a list of rows into chunks of the given size
+    :param rows:
+    :param size:
+    :return:
+    """
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+def _build_get(table, where=None, fields=['*'], sort=None, limit=None):
+    """
+    Build a SELECT query and its parameters
+    :return: tuple (sql, params)
+    """
+    # Most calls are a plain SELECT * with some WHERE clauses, so look those up by just the table and the WHERE keys,
+    # rather than building the full template cache key.
+    if sort is None and limit is None and fields == ALL_FIELDS:
+        return _compile_select_all(table, tuple(where) if where else None), list(where.values()) if where else []
+
+    if isinstance(fields, str):
+        fields = [fields]
+
+    sql = _compile_get(table, tuple(fields), tuple(where) if where else None, tuple(sort) if sort is not None else None, limit)
+    return sql, list(where.values()) if where else []
+
+def _build_insert(table, params):
+    """
+    Build an INSERT query and its parameters
+    :return: tuple (sql, params)
+    """
+    return _compile_insert(table, tuple(params)), list(params.values())
+
+def _build_delete(table, params):
+    """
+    Build a DELETE query and its parameters
+    :return: tuple (sql, params)
+    """
+    return _compile_delete(table, tuple(params)), list(params.values())
+
+def _build_update(table, params, where=None):
+    """
+    Build an UPDATE query and its parameters
+    :return: tuple (sql, params)
+    """
+    sql = _compile_update(table, tuple(params), tuple(where) if where else None)
+    sql_params = list(params.values())
+
+    if where:
+        sql_params += list(where.values())
+
+    return sql, sql_params
+
+def _build_increment(table, column, delta, where, insert_defaults=None, minimum=None):
+    """
+    Build an atomic increment query and its parameters
+    :return: tuple (sql, params)
+    """
+    defaults = insert_defaults or {}
+    sql = _compile_increment(table, column, tuple(where), tuple(defaults), minimum)
+
+    # If there is no row yet, it is inserted with the delta as its value.
+    initial = delta if minimum is None else max(delta, minimum)
+    return sql, list(where.values()) + [initial] + list(defaults.values()) + [delta]
+
+def _record(sql, caller, duration):
+    """
+    Record the time a query took in the query stats, tagged with its operation, table and the method which ran it
+    :param sql:
+    :param caller:
+    :param duration: Seconds
+    :return:
+    """
+    operation, table = parse_sql(sql)
+    QueryStats.instance().record(operation, table, caller, duration, sql)
+
+def _cache_lookup(table, where, fields, sort, limit, one):
+    """
+    Look up a get/get_all query in the row cache. Queries inside a transaction always go to the database.
+    :return: tuple (key, generation, result). The key is None if the query isn't cacheable, the result is MISSING if it isn't cached.
+    """
+    cache = RowCache.instance()
+    if not cache.is_cached(table) or _transaction_writes.get() is not None:
+        return None, None, MISSING
+
+    key = cache.key(table, where, fields, sort, limit, one)
+    return key, cache.get_generation(table), cache.get(key)
+
+def _cache_store(key, generation, table, where, result):
+    """
+    Store the result of a query in the row cache, if it was cacheable
+    :return:
+    """
+    if key is not None:
+        RowCache.instance().set(key, table, where, result, generation)
+
+def _invalidate(table, where=None, values=None):
+    """
+    Remove any cached results a write could have changed, or all of the table's if we don't know which rows it wrote.
+    :param table:
+    :param where: The WHERE clause of the rows written (None for an insert)
+    :param values: The new column values (None for a delete)
+    :return:
+    """
+    cache = RowCache.instance()
+    if not cache.is_cached(table):
+        return
+
+    if where is None and values is None:
+        cache.clear(table)
+    else:
+        cache.invalidate(table, where, values)
+
+    # Until the transaction commits, other tasks can still read the old rows back into the cache, so clear it again after.
+    writes = _transaction_writes.get()
+    if writes is not None:
+        writes.add(table)
+
+@contextlib.contextmanager
+def _track_writes():
+    """
+    Keep track of the cached tables written to inside a transaction, and clear them from the cache once it has finished
+    :return:
+    """
+    if _transaction_writes.get() is not None:
+        yield
+        return
+
+    writes = set()
+    token = _transaction_writes.set(writes)
+    try:
+        yield
+    finally:
+        _transaction_writes.reset(token)
+        for table in writes:
+            RowCache.instance().clear(table)
+
+def _connect(config):
+    """
+    Open a new connection to the database, using the settings.json configuration.
+    The db_engine setting picks MySQL (the default) or SQLite, which is stored in the db_path file.
+    :param config:
+    :return:
+    """
+    if getattr(config, 'db_engine', 'mysql') == 'sqlite':
+        return sqlite.connect(getattr(config, 'db_path', DEFAULT_SQLITE_PATH))
+
+    return pymysql.connect(host=config.db_host, user=config.db_user, passwd=config.db_pass, db=config.db_name, autocommit=True)
+
+def _close(connection):
+    """
+    Close a connection, ignoring any errors as we are getting rid of it anyway
+    :param connection:
+    :return:
+    """
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+def _close_result(future):
+    """
+    Close the connection a finished connect future opened, if it opened one
+    :param future:
+    :return:
+    """
+    if not future.cancelled() and future.exception() is None:
+        _close(future.result())
+
+def _stream_cursor(connection):
+    """
+    Get an unbuffered cursor for the connection, which reads the rows from the server as they are fetched, instead
+    of all at once
+    :param connection:
+    :return:
+    """
+    return connection.cursor(pymysql.cursors.SSDictCursor if pymysql else None)
+
+def _cursor(connection):
+    """
+    Get a cursor for the connection, with DictCursor so we can refer to results by their keys
+    :param connection:
+    :return:
+    """
+    return connection.cursor(pymysql.cursors.DictCursor if pymysql else None)
+
 @Singleton
 class Database:
 
+    DEFAULT_THREADS = 4
+    DEFAULT_QUEUE_WARN = 20
+    DEFAULT_CHUNK_SIZE = 500
+    DEFAULT_MAX_SPARE = 2
+
     # Create database connection
     def __init__(self):
 
         self.__path = os.path.abspath(os.path.dirname(__file__))
 
         # Load the connection configuration
-        config = lib.get(self.__path + '/../settings.json')
-        self.connection = pymysql.connect(host=config.db_host, user=config.db_user, passwd=config.db_pass, db=config.db_name, autocommit=True)
+        config = lib.get_config()
+        self.__config = config
+        self.__connection = _connect(config)
 
         # Set the cursor to be used, with DictCursor so we can refer to results by their keys
-        self.cursor = self.connection.cursor(pymysql.cursors.DictCursor)
+        self.__cursor = _cursor(self.__connection)
+
+        # Worker threads in offload mode get their own connection and cursor, stored here
+        self.__local = threading.local()
+
+        # Offload mode sends blocking calls made through `run` to a bounded pool of worker threads
+        self.__offload = bool(getattr(config, 'db_offload', False))
+        self.__threads = int(getattr(config, 'db_threads', self.DEFAULT_THREADS))
+        self.__queue_warn = int(getattr(config, 'db_queue_warn', self.DEFAULT_QUEUE_WARN))
+        self.__queue = {'pending': 0, 'peak': 0, 'submitted': 0, 'wait_total': 0.0, 'wait_max': 0.0}
+        self.__queue_lock = threading.Lock()
+        self.__executor = None
+
+        # Maximum number of rows to send in one statement, for the bulk insert/update methods
+        self.__chunk_size = int(getattr(config, 'db_chunk_size', self.DEFAULT_CHUNK_SIZE))
+
+        # Connections for transactions and streamed queries, which are kept once opened so they can be reused by the
+        # next one, up to db_max_spare of them. Any more than that are closed when they are given back.
+        self.__spare = []
+        self.__max_spare = int(getattr(config, 'db_max_spare', self.DEFAULT_MAX_SPARE))
+
+        if self.__offload:
+            self.__executor = ThreadPoolExecutor(max_workers=self.__threads, thread_name_prefix='db-worker', initializer=self.__open_thread_connection)
 
     # Close connection on destruction of object
     def __del__(self):
-        self.connection.close()
+        self.__connection.close()
+
+    def __open_thread_connection(self):
+        """
+        Open the connection for an offload worker thread. This is run once, when the thread is started.
+        :return:
+        """
+        self.__local.connection = _connect(self.__config)
+        self.__local.cursor = _cursor(self.__local.connection)
+
+    @property
+    def connection(self):
+        """
+        Get the connection to use. Transactions and offload worker threads have their own, otherwise it is the shared one.
+        :return:
+        """
+        transaction = _transaction.get()
+        if transaction is not None:
+            return transaction.connection
+
+        return getattr(self.__local, 'connection', self.__connection)
+
+    @property
+    def cursor(self):
+        """
+        Get the cursor to use. Transactions and offload worker threads have their own, otherwise it is the shared one.
+        :return:
+        """
+        transaction = _transaction.get()
+        if transaction is not None:
+            return transaction
+
+        return getattr(self.__local, 'cursor', self.__cursor)
+
+    def __take_spare(self):
+        """
+        Get a spare connection, or open a new one if there aren't any
+        :return:
+        """
+        return self.__spare.pop() if self.__spare else _connect(self.__config)
+
+    def __return_spare(self, connection):
+        """
+        Give a connection back to be reused, closing it instead if it was lost or we already have enough spares
+        :param connection:
+        :return:
+        """
+        if connection.open and len(self.__spare) < self.__max_spare:
+            self.__spare.append(connection)
+        else:
+            _close(connection)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Run all the queries inside the `with` block in one transaction, which is committed once at the end, or rolled
+        back if there is an exception.
+        The transaction gets its own connection, so it is safe to use across `await`s, without picking up queries from
+        other commands that are running at the same time. Nested transactions become part of the outer one.
+        e.g. `with db.transaction():`
+        :return:
+        """
+        if _transaction.get() is not None:
+            yield self
+            return
+
+        connection = self.__take_spare()
+        connection.ping(reconnect=True)
+        connection.autocommit(False)
+        cursor = _cursor(connection)
+        token = _transaction.set(cursor)
+
+        try:
+            with _track_writes():
+                yield self
+        except BaseException:
+            connection.rollback()
+            raise
+        else:
+            connection.commit()
+        finally:
+            _transaction.reset(token)
+            cursor.close()
+            if connection.open:
+                connection.autocommit(True)
+            self.__return_spare(connection)
+
+    @contextlib.asynccontextmanager
+    async def transaction_async(self):
+        """
+        Async version of `transaction`, which runs in a DatabasePool transaction instead of blocking on one of our own.
+        The Database calls (sync or `*_async`) and the DatabasePool calls inside the `async with` block all run on the
+        pool transaction's connection, and are committed once at the end, or rolled back if there is an exception.
+        The Database calls don't wait for the pool's lock, so don't run them at the same time as pool calls in the same
+        transaction (e.g. with asyncio.gather).
+        e.g. `async with db.transaction_async():`
+        :return:
+        """
+        if _transaction.get() is not None:
+            yield self
+            return
+
+        async with DatabasePool.instance().transaction():
+
+            connection, lock = _pool_transaction.get()
+            cursor = _cursor(connection)
+            token = _transaction.set(cursor)
+
+            try:
+                yield self
+            finally:
+                _transaction.reset(token)
+                cursor.close()
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Run a blocking database function without blocking the event loop.
+        In offload mode it is sent to one of the worker threads, which uses its own connection. Otherwise it is just
+        run straight away on the shared connection.
+        e.g. `await db.run(db.get_all, 'user_goals', {'user': 1})`
+        :param fn:
+        :return: Whatever `fn` returns
+        """
+        # Worker threads can't see the current task's transaction, so anything inside one is run straight away on it.
+        if not self.__offload or _transaction.get() is not None:
+            return fn(*args, **kwargs)
+
+        # Keep track of how many calls are waiting on the workers, so we can tune the number of threads.
+        self.__queue['submitted'] += 1
+        self.__queue['pending'] += 1
+        self.__queue['peak'] = max(self.__queue['peak'], self.__queue['pending'])
+
+        queued = self.__queue['pending'] - self.__threads
+        if queued > self.__queue_warn:
+            lib.debug('[DB] Offload queue depth is ' + str(queued) + ' (' + str(self.__threads) + ' threads)')
+
+        # The worker thread's stack doesn't go back to whatever called us, so work out the caller here for the query stats.
+        caller = get_caller()
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.__executor, functools.partial(self.__run_as, caller, time.perf_counter(), fn, *args, **kwargs))
+        finally:
+            self.__queue['pending'] -= 1
+
+    def __run_as(self, caller, submitted, fn, *args, **kwargs):
+        """
+        Run a function on an offload worker thread, with the queries it makes recorded against the given caller
+        :param caller:
+        :param submitted: When the call was sent to the workers (perf_counter), to work out how long it waited
+        :param fn:
+        :return:
+        """
+        wait = (time.perf_counter() - submitted) * 1000
+        with self.__queue_lock:
+            self.__queue['wait_total'] += wait
+            self.__queue['wait_max'] = max(self.__queue['wait_max'], wait)
+
+        # The worker's connection may have been idle for longer than the server's wait_timeout, so reconnect if it was dropped
+        self.__local.connection.ping(reconnect=True)
+
+        self.__local.caller = caller
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.__local.caller = None
+
+    def __execute(self, sql, params, many=False):
+        """
+        Run a query on the current cursor, recording how long it took
+        :param sql:
+        :param params:
+        :param many: Use executemany, with a list of params
+        :return: int Affected rows
+        """
+        cursor = self.cursor
+        start = time.perf_counter()
+        try:
+            if many:
+                return cursor.executemany(sql, params)
+            return cursor.execute(sql, params)
+        finally:
+            _record(sql, getattr(self.__local, 'caller', None) or get_caller(), time.perf_counter() - start)
+
+    def get_queue_stats(self):
+        """
+        Get the offload queue metrics. Waits are how long calls waited for a worker thread, in ms.
+        :return: dict
+        """
+        with self.__queue_lock:
+            stats = dict(self.__queue)
+
+        stats['threads'] = self.__threads if self.__offload else 0
+        stats['queued'] = max(0, stats['pending'] - stats['threads'])
+        stats['wait_avg'] = stats['wait_total'] / stats['submitted'] if stats['submitted'] else 0.0
+        return stats
 
     def install(self):
 
@@ -46,117 +631,482 @@ class Database:
             self.connection.commit()
             return True
 
-    def __build_get(self, table, where=None, fields=['*'], sort=None, limit=None):
+    def get_schema_fingerprint(self):
+        """
+        Get a hash of the install files, the update files and the database version, which changes whenever any of them do.
+        If it matches the one stored in bot_settings, the schema is already up to date.
+        :return: string
+        """
+        fingerprint = hashlib.sha1()
 
-        params = []
+        for directory in ['/../data/install/', '/../data/updates/']:
+            for filename in sorted(os.listdir(self.__path + directory)):
+                if filename.endswith('.sql') or filename.endswith('.update'):
+                    fingerprint.update(filename.encode())
+                    with open(self.__path + directory + filename, 'rb') as file:
+                        fingerprint.update(file.read())
 
-        sql = 'SELECT ' + ', '.join(fields) + ' ' \
-              'FROM ' + table + ' '
+        fingerprint.update(lib.get(self.__path + '/../version.json').db_version.encode())
+        return fingerprint.hexdigest()
 
-        # Did we specify some WHERE clauses?
-        if where is not None:
+    def get(self, table, where=None, fields=['*'], sort=None):
 
-            sql += 'WHERE '
+        key, generation, result = _cache_lookup(table, where, fields, sort, None, True)
+        if result is MISSING:
+            self.__execute(*_build_get(table, where, fields, sort))
+            result = self.cursor.fetchone()
+            _cache_store(key, generation, table, where, result)
 
-            for field, value in where.items():
-                sql += field + ' = %s AND '
-                params.append(value)
+        return result
 
-            # Remove the last 'AND '
-            sql = sql[:-4]
+    def get_sql(self, sql, params):
+        self.__execute(sql, params)
+        return self.cursor.fetchone()
 
-        # Did we specify some sorting?
-        if sort is not None:
-            sql += ' ORDER BY ' + ', '.join(sort)
+    def get_all(self, table, where=None, fields=['*'], sort=None, limit=None):
 
-        # Is there a limit?
-        if limit is not None:
-            sql += ' LIMIT ' + str(limit)
+        key, generation, result = _cache_lookup(table, where, fields, sort, limit, False)
+        if result is MISSING:
+            self.__execute(*_build_get(table, where, fields, sort, limit))
+            result = list(self.cursor.fetchall())
+            _cache_store(key, generation, table, where, result)
 
-        self.cursor.execute(sql, params)
+        return result
 
-    def __build_insert(self, table, params):
+    def get_all_sql(self, sql, params):
+        self.__execute(sql, params)
+        return self.cursor.fetchall()
 
-        # Create param placeholders to be used in the query
-        placeholders = ['%s'] * len(params.values())
+    def insert(self, table, params):
+        rows = self.__execute(*_build_insert(table, params))
+        _invalidate(table, None, params)
+        return rows
 
-        sql = 'INSERT INTO ' + table + ' '
-        sql += '(' + ','.join(params.keys()) + ') '
-        sql += 'VALUES '
-        sql += '(' + ','.join(placeholders) + ') '
+    def delete(self, table, params):
+        rows = self.__execute(*_build_delete(table, params))
+        _invalidate(table, params)
+        return rows
 
-        sql_params = list(params.values())
-        self.cursor.execute(sql, sql_params)
+    def update(self, table, params, where=None):
+        rows = self.__execute(*_build_update(table, params, where))
+        _invalidate(table, where or {}, params)
+        return rows
 
-    def __build_delete(self, table, params):
+    def execute(self, sql, params):
+        rows = self.__execute(sql, params)
 
-        sql_params = []
-        sql = 'DELETE FROM ' + table + ' WHERE '
+        # We don't know which rows a raw query wrote, so anything cached for its table has to go
+        operation, table = parse_sql(sql)
+        if operation != 'select':
+            _invalidate(table)
 
-        for field, value in params.items():
-            sql += field + ' = %s AND '
-            sql_params.append(value)
+        return rows
 
-        # Remove the last 'AND '
-        sql = sql[:-4]
+    def increment(self, table, column, delta, where, insert_defaults=None, minimum=None):
+        """
+        Atomically add to a counter column, inserting the row if it doesn't exist yet.
+        This is done in one statement, so concurrent updates can't overwrite each other.
+        The `where` columns must make up a unique key on the table.
+        e.g. `db.increment('user_stats', 'value', 5, {'user': 1, 'name': 'total_words_written'})`
+        :param table:
+        :param column: The column to add to
+        :param delta: The amount to add (can be negative)
+        :param where: dict of the unique key columns and values of the row
+        :param insert_defaults: dict of any other columns to set, if the row has to be inserted
+        :param minimum: Don't let the value go below this
+        :return: int Affected rows (1 if inserted, 2 if updated on MySQL, always 1 on SQLite)
+        """
+        rows = self.__execute(*_build_increment(table, column, delta, where, insert_defaults, minimum))
+        _invalidate(table)
+        return rows
 
-        # Execute the query
-        self.cursor.execute(sql, sql_params)
+    def insert_many(self, table, rows, chunk_size=None):
+        """
+        Insert a list of rows, using multi-row INSERT statements of up to `chunk_size` rows each
+        :param table:
+        :param rows: list of dicts, which must all have the same keys
+        :param chunk_size: Defaults to the db_chunk_size setting
+        :return: int Affected rows
+        """
+        return self.__insert_many(table, rows, None, chunk_size)
 
-    def __build_update(self, table, params, where=None):
+    def upsert_many(self, table, rows, update, chunk_size=None):
+        """
+        Insert a list of rows, updating the `update` columns of any which already exist on a unique key
+        :param table:
+        :param rows: list of dicts, which must all have the same keys
+        :param update: list of columns to update when the row already exists
+        :param chunk_size: Defaults to the db_chunk_size setting
+        :return: int Affected rows (1 per inserted row, 2 per updated row)
+        """
+        return self.__insert_many(table, rows, tuple(update), chunk_size)
 
-        sql_params = []
-        sql = 'UPDATE ' + table + ' SET '
+    def __insert_many(self, table, rows, update, chunk_size):
 
-        # Set values
-        for field, value in params.items():
-            sql += field + ' = %s, '
-            sql_params.append(value)
+        if not rows:
+            return 0
 
-        # Remove the last ', '
-        sql = sql[:-2]
+        fields = tuple(rows[0])
+        total = 0
 
-        # Where clauses
-        if where is not None:
-            sql += ' WHERE '
+        for chunk in _chunks(rows, chunk_size or self.__chunk_size):
+            sql = _compile_insert_many(table, fields, len(chunk), update)
+            total += self.__execute(sql, [row[field] for row in chunk for field in fields])
 
-            for field, value in where.items():
-                sql += field + ' = %s AND '
-                sql_params.append(value)
+        _invalidate(table)
+        return total
 
-            # Remove the last 'AND '
-            sql = sql[:-4]
+    def update_many(self, table, rows, where, chunk_size=None):
+        """
+        Update a list of rows, with one UPDATE statement sent for each row in a chunk via executemany
+        e.g. `db.update_many('user_goals', [{'id': 1, 'current': 0}, {'id': 2, 'current': 0}], ['id'])`
+        :param table:
+        :param rows: list of dicts, containing both the columns to set and the `where` columns, which must all have the same keys
+        :param where: list of the columns to use in the WHERE clause
+        :param chunk_size: Defaults to the db_chunk_size setting
+        :return: int Affected rows
+        """
+        if not rows:
+            return 0
 
-        # Execute the query
-        self.cursor.execute(sql, sql_params)
+        where = tuple(where)
+        fields = tuple(field for field in rows[0] if field not in where)
+        sql = _compile_update(table, fields, where)
+        total = 0
 
-    def get(self, table, where=None, fields=['*'], sort=None):
-        self.__build_get(table, where, fields, sort)
-        return self.cursor.fetchone()
+        for chunk in _chunks(rows, chunk_size or self.__chunk_size):
+            total += self.__execute(sql, [[row[field] for field in fields + where] for row in chunk], many=True)
 
-    def get_sql(self, sql, params):
-        self.cursor.execute(sql, params)
-        return self.cursor.fetchone()
+        _invalidate(table)
+        return total
 
-    def get_all(self, table, where=None, fields=['*'], sort=None, limit=None):
-        self.__build_get(table, where, fields, sort, limit)
-        return self.cursor.fetchall()
+    def delete_many(self, table, column, values, chunk_size=None):
+        """
+        Delete all the rows where the column matches one of the values
+        :param table:
+        :param column:
+        :param values:
+        :param chunk_size: Defaults to the db_chunk_size setting
+        :return: int Affected rows
+        """
+        total = 0
 
-    def get_all_sql(self, sql, params):
-        self.cursor.execute(sql, params)
-        return self.cursor.fetchall()
+        for chunk in _chunks(list(values), chunk_size or self.__chunk_size):
+            total += self.__execute(_compile_delete_many(table, column, len(chunk)), chunk)
 
-    def insert(self, table, params):
-        self.__build_insert(table, params)
-        return self.cursor.rowcount
+        _invalidate(table)
+        return total
 
-    def delete(self, table, params):
-        self.__build_delete(table, params)
-        return self.cursor.rowcount
+    async def iter_sql(self, sql, params, batch_size=None):
+        """
+        Stream the results of a query in batches, so large scans don't have to load every row into memory at once.
+        The query runs on its own connection with an unbuffered cursor, and we give the event loop a chance to run
+        other tasks between batches.
+        e.g. `async for records in db.iter_sql('SELECT * FROM user_goals WHERE reset <= %s', [now]):`
+        :param sql:
+        :param params:
+        :param batch_size: Rows per batch. Defaults to the db_chunk_size setting.
+        :return: async generator of lists of rows
+        """
+        batch_size = batch_size or self.__chunk_size
 
-    def update(self, table, params, where=None):
-        self.__build_update(table, params, where)
-        return self.cursor.rowcount
+        # Inside a transaction we need to see its uncommitted changes, so use its cursor instead.
+        if _transaction.get() is not None:
+            records = self.get_all_sql(sql, params)
+            for batch in _chunks(records, batch_size):
+                yield batch
+                await asyncio.sleep(0)
+            return
 
-    def execute(self, sql, params):
-        return self.cursor.execute(sql, params)
+        connection = self.__take_spare()
+        connection.ping(reconnect=True)
+        cursor = _stream_cursor(connection)
+        caller = get_caller()
+
+        try:
+
+            start = time.perf_counter()
+            try:
+                await self.run(cursor.execute, sql, params)
+            finally:
+                _record(sql, caller, time.perf_counter() - start)
+
+            while True:
+
+                batch = await self.run(cursor.fetchmany, batch_size)
+                if not batch:
+                    break
+
+                yield list(batch)
+                await asyncio.sleep(0)
+
+        finally:
+            # Closing an unbuffered cursor reads any rows we didn't get to, so the connection can be used again.
+            cursor.close()
+            self.__return_spare(connection)
+
+    async def get_async(self, table, where=None, fields=['*'], sort=None):
+        return await self.run(self.get, table, where, fields, sort)
+
+    async def get_sql_async(self, sql, params):
+        return await self.run(self.get_sql, sql, params)
+
+    async def get_all_async(self, table, where=None, fields=['*'], sort=None, limit=None):
+        return await self.run(self.get_all, table, where, fields, sort, limit)
+
+    async def get_all_sql_async(self, sql, params):
+        return await self.run(self.get_all_sql, sql, params)
+
+    async def update_async(self, table, params, where=None):
+        return await self.run(self.update, table, params, where)
+
+@Singleton
+class DatabasePool:
+    """
+    Asyncio connection pool, for queries which should not block the event loop.
+    Each call checks out its own connection, so queries from different guilds/shards can run concurrently instead of
+    queueing up on the single shared connection of the `Database` singleton.
+    The blocking pymysql calls are run on a thread per connection, so the event loop is free while they wait on the server.
+    """
+
+    DEFAULT_SIZE = 5
+
+    def __init__(self):
+
+        self.__path = os.path.abspath(os.path.dirname(__file__))
+
+        # Load the connection configuration and work out how many connections we are allowed to open
+        self.__config = lib.get_config()
+        self.size = int(getattr(self.__config, 'db_pool_size', self.DEFAULT_SIZE))
+
+        # One worker thread per connection, so a checked out connection can always run its query straight away
+        self.__executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix='db-pool')
+
+        # The idle queue is created on first use, so it belongs to the event loop the bot is running on
+        self.__idle = None
+        self.__opened = 0
+
+    async def __checkout(self):
+        """
+        Get a connection from the pool, opening a new one if we are under the pool size, or waiting for one to be
+        returned if we are not
+        :return: connection
+        """
+        if self.__idle is None:
+            self.__idle = asyncio.Queue()
+
+        while True:
+
+            if self.__idle.empty() and self.__opened < self.size:
+                return await self.__open()
+
+            # None is put on the queue when a connection is dropped, so we can open a new one in its place
+            connection = await self.__idle.get()
+            if connection is not None:
+                return connection
+
+    async def __open(self):
+        """
+        Open a new connection for the pool
+        :return: connection
+        """
+        self.__opened += 1
+        future = self.__executor.submit(_connect, self.__config)
+        try:
+            return await asyncio.wrap_future(future)
+        except BaseException:
+            # If we were cancelled, the thread may still open the connection, so close it once it has
+            self.__release()
+            future.add_done_callback(_close_result)
+            raise
+
+    def __release(self):
+        """
+        Free the slot of a connection which has been dropped, and wake up a task waiting for a connection, so it can
+        open a new one
+        :return:
+        """
+        self.__opened -= 1
+        if self.__idle is not None:
+            self.__idle.put_nowait(None)
+
+    def __checkin(self, connection, broken=False):
+        """
+        Return a connection to the pool. Broken connections are closed and dropped, so a fresh one is opened next time.
+        :param connection:
+        :param broken:
+        :return:
+        """
+        if broken:
+            self.__release()
+            _close(connection)
+        else:
+            self.__idle.put_nowait(connection)
+
+    @staticmethod
+    def __run(connection, sql, params, fetch):
+        """
+        Run the query on the given connection. This is the blocking part, and is run in the pool's executor.
+        :param connection:
+        :param sql:
+        :param params:
+        :param fetch: 'one', 'all', or None to return the affected row count
+        :return:
+        """
+        connection.ping(reconnect=True)
+        with _cursor(connection) as cursor:
+            result = cursor.execute(sql, params)
+            if fetch == 'one':
+                return cursor.fetchone()
+            elif fetch == 'all':
+                return cursor.fetchall()
+            else:
+                return result
+
+    @contextlib.asynccontextmanager
+    async def transaction(self):
+        """
+        Run all the pool queries inside the `async with` block on one connection, in one transaction, which is committed
+        once at the end, or rolled back if there is an exception. Nested transactions become part of the outer one.
+        e.g. `async with pool.transaction():`
+        :return:
+        """
+        if _pool_transaction.get() is not None:
+            yield self
+            return
+
+        connection = await self.__checkout()
+        loop = asyncio.get_running_loop()
+
+        # The lock stops concurrent tasks inside the same transaction from using the connection at the same time.
+        token = _pool_transaction.set((connection, asyncio.Lock()))
+
+        try:
+            await loop.run_in_executor(self.__executor, connection.begin)
+            with _track_writes():
+                yield self
+        except BaseException:
+            await loop.run_in_executor(self.__executor, connection.rollback)
+            raise
+        else:
+            await loop.run_in_executor(self.__executor, connection.commit)
+        finally:
+            _pool_transaction.reset(token)
+            self.__checkin(connection, broken=not connection.open)
+
+    async def __query(self, sql, params, fetch=None):
+        """
+        Check out a connection, run the query without blocking the event loop, then return the connection to the pool.
+        :return:
+        """
+        loop = asyncio.get_running_loop()
+        caller = get_caller()
+
+        # If we are in a transaction, the query has to run on its connection.
+        transaction = _pool_transaction.get()
+        if transaction is not None:
+            connection, lock = transaction
+            async with lock:
+                start = time.perf_counter()
+                try:
+                    return await loop.run_in_executor(self.__executor, self.__run, connection, sql, params, fetch)
+                finally:
+                    _record(sql, caller, time.perf_counter() - start)
+
+        connection = await self.__checkout()
+        start = time.perf_counter()
+        future = self.__executor.submit(self.__run, connection, sql, params, fetch)
+        try:
+            result = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # The query may still be running on the executor thread, so we can't hand this connection to anyone else.
+            # Close it once the thread is finished with it instead, so it isn't left open.
+            self.__release()
+            future.add_done_callback(lambda _: _close(connection))
+            raise
+        except CONNECTION_ERRORS:
+            self.__checkin(connection, broken=True)
+            raise
+        except Exception:
+            self.__checkin(connection)
+            raise
+        else:
+            self.__checkin(connection)
+            return result
+        finally:
+            _record(sql, caller, time.perf_counter() - start)
+
+    async def get(self, table, where=None, fields=['*'], sort=None):
+
+        key, generation, result = _cache_lookup(table, where, fields, sort, None, True)
+        if result is MISSING:
+            sql, params = _build_get(table, where, fields, sort)
+            result = await self.__query(sql, params, 'one')
+            _cache_store(key, generation, table, where, result)
+
+        return result
+
+    async def get_sql(self, sql, params):
+        return await self.__query(sql, params, 'one')
+
+    async def get_all(self, table, where=None, fields=['*'], sort=None, limit=None):
+
+        key, generation, result = _cache_lookup(table, where, fields, sort, limit, False)
+        if result is MISSING:
+            sql, params = _build_get(table, where, fields, sort, limit)
+            result = list(await self.__query(sql, params, 'all'))
+            _cache_store(key, generation, table, where, result)
+
+        return result
+
+    async def get_all_sql(self, sql, params):
+        return await self.__query(sql, params, 'all')
+
+    async def insert(self, table, params):
+        sql, sql_params = _build_insert(table, params)
+        rows = await self.__query(sql, sql_params)
+        _invalidate(table, None, params)
+        return rows
+
+    async def delete(self, table, params):
+        sql, sql_params = _build_delete(table, params)
+        rows = await self.__query(sql, sql_params)
+        _invalidate(table, params)
+        return rows
+
+    async def update(self, table, params, where=None):
+        sql, sql_params = _build_update(table, params, where)
+        rows = await self.__query(sql, sql_params)
+        _invalidate(table, where or {}, params)
+        return rows
+
+    async def execute(self, sql, params):
+        rows = await self.__query(sql, params)
+
+        operation, table = parse_sql(sql)
+        if operation != 'select':
+            _invalidate(table)
+
+        return rows
+
+    async def increment(self, table, column, delta, where, insert_defaults=None, minimum=None):
+        sql, params = _build_increment(table, column, delta, where, insert_defaults, minimum)
+        rows = await self.__query(sql, params)
+        _invalidate(table)
+        return rows
+
+def unit_of_work(command):
+    """
+    Decorator for command handlers, to run all of the command's queries in one transaction, which is committed once
+    when the command has finished. It is opt-in, for commands which make a lot of writes.
+    Anything the command sends to Discord is sent while the transaction is still open, so commands which send messages
+    between their writes should wrap just the writes in `transaction` or `transaction_async` instead.
+    :param command:
+    :return:
+    """
+    @functools.wraps(command)
+    async def wrapper(*args, **kwargs):
+        async with Database.instance().transaction_async():
+            return await command(*args, **kwargs)
+
+    return wrapper
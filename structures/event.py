@@ -340,12 +340,7 @@ class Event:
         :param amount:
         :return:
         """
-        amount = int(amount)
-        record = self.__db.get('user_events', {'user': user_id, 'event': self.get_id()})
-        if record:
-            amount = int(record['words']) + amount
-
-        return self.update_wordcount(user_id, amount)
+        return self.__db.increment('user_events', 'words', int(amount), {'event': self.get_id(), 'user': user_id})
 
     async def say(self, message, embed=False):
         """
@@ -402,7 +397,7 @@ class Event:
         :return:
         """
 
-        config = lib.get('./settings.json')
+        config = lib.get_config()
         users = self.get_users()
 
         # Build the embedded leaderboard message
@@ -1,4 +1,79 @@
 import lib, random, re, string
+from structures.assetpack import AssetPack, get_pack
+
+# numpy is only used to speed up generating a lot of names at once, so the generator works without it
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class Grammar:
+    """
+    A gen_* asset compiled into a list of formats, where each format is a list of tokens: either a literal string, or
+    the index of the slot to fill in with one of its choices. This is done once per asset, so generating names doesn't
+    need any regex or dict lookups.
+    The source is either the parsed JSON asset, or its asset pack, which is already compiled.
+    """
+
+    SLOT = re.compile(r"\$([a-z0-9]+)")
+
+    def __init__(self, source):
+
+        self.source = source
+
+        if isinstance(source, AssetPack):
+            self.slots = source.slots
+            self.formats = source.get_formats()
+        else:
+            self.compile(source)
+
+        self.__slot_counts = None
+
+    def get_slot_counts(self):
+        """
+        Get how many times each slot appears in each format, so we can work out how many choices a numpy batch needs
+        from each slot. This is only worked out the first time it is needed.
+        :return: numpy array of (format, slot)
+        """
+        if self.__slot_counts is None:
+            self.__slot_counts = numpy.zeros((len(self.formats), len(self.slots)), dtype=numpy.int64)
+            for i, tokens in enumerate(self.formats):
+                for token in tokens:
+                    if isinstance(token, int):
+                        self.__slot_counts[i, token] += 1
+
+        return self.__slot_counts
+
+    def compile(self, source):
+        """
+        Compile the parsed JSON asset into slots and formats
+        :param source:
+        :return:
+        """
+        # Store the slot choices as a list, so the tokens can refer to them by index
+        names = list(source['names'].keys())
+        self.slots = [source['names'][name] for name in names]
+        index = {name: i for i, name in enumerate(names)}
+
+        self.formats = []
+        for format in source['formats']:
+
+            tokens = []
+            position = 0
+            for match in self.SLOT.finditer(format):
+
+                if match.start() > position:
+                    tokens.append(format[position:match.start()])
+
+                # Slots which aren't in the asset just come out as their name, without the $
+                name = match.group(1)
+                tokens.append(index[name] if name in index else name)
+                position = match.end()
+
+            if position < len(format):
+                tokens.append(format[position:])
+
+            self.formats.append(tokens)
 
 class NameGenerator:
 
@@ -6,94 +81,211 @@ class NameGenerator:
     DEFAULT_AMOUNT = 10
     MAX_RETRIES = 10
 
-    def __init__(self, type, context):
+    # Batches of at least this many names have their choices drawn with numpy, if it is installed. Below this, the
+    # numpy call overhead costs about as much as it saves.
+    NUMPY_BATCH_SIZE = 100
+
+    # Compiled grammars of each asset, keyed by the asset file and language
+    _grammars = {}
+
+    def __init__(self, type, context, seed=None):
+        """
+        :param type:
+        :param context:
+        :param seed: Seed for the random choices, so the same names can be generated again (e.g. in benchmarks)
+        """
         self.type = type
         self.context = context
-        self._last = ''
+        self.rng = random.Random(seed)
 
-    def generate(self, amount):
+    def get_grammar(self):
+        """
+        Get the compiled grammar of the asset for this type, compiling it if the asset hasn't been compiled yet (or has
+        been reloaded since)
+        :return: Grammar, or None if there is no asset for this type
+        """
+        asset_file = 'gen_' + self.type
+        lang = lib.get_lang(self.context.guild.id)
 
-        generated_names = []
+        # Use the memory-mapped asset pack if it has been built, otherwise the JSON asset
+        source = get_pack(asset_file, lang) or lib.get_asset(asset_file, self.context.guild.id)
+        if not source:
+            return None
 
-        # If the amount if higher than the max, set it to the max
-        if amount > self.MAX_AMOUNT:
-            amount = self.MAX_AMOUNT
+        key = (asset_file, lang)
+        grammar = NameGenerator._grammars.get(key)
+        if grammar is None or grammar.source is not source:
+            grammar = NameGenerator._grammars[key] = Grammar(source)
 
-        # If it's less than 1 for any reason, just use the default
-        if amount is None or amount < 1:
-            amount = self.DEFAULT_AMOUNT
+        return grammar
 
-        # # If the type is 'idea' or 'prompt', change the amount to 1, as that will take up too much space.
-        # if self.type == 'idea' or self.type == 'prompt':
-        #     amount = 1
+    def generate_name(self, grammar):
+        """
+        Generate one name from a grammar
+        :param grammar:
+        :return: string
+        """
+        # Pick a random format to use
+        tokens = self.rng.choice(grammar.formats)
 
-        asset_file = 'gen_' + self.type
-        source = lib.get_asset(asset_file, self.context.guild.id)
-        retry_attempts = 0
+        # The last chosen element, so we don't have the same thing twice in a row
+        last = ''
+        parts = []
 
-        # If we loaded the asset source okay, then let's loop through and generate some responses
-        if source:
+        for token in tokens:
 
-            # Store all the name choices before we start the loop
-            choices = source['names']
+            if isinstance(token, int):
 
-            def replace(match):
+                choices = grammar.slots[token]
+                choice = self.rng.choice(choices)
 
-                match = match.group().replace('$', '')
+                # Make sure it's not the same as the last one.
+                # Only try a maximum of self.MAX_RETRIES times though, we don't want a situation where an infinite loop could happen
+                i = 0
+                while len(choice) > 2 and choice == last and i < self.MAX_RETRIES:
+                    i += 1
+                    choice = self.rng.choice(choices)
 
-                if match in choices.keys():
+                last = choice
+                parts.append(choice)
 
-                    # Generate a choice
-                    choice = random.choice(choices[match])
+            else:
+                parts.append(token)
 
-                    i = 0
+        return ''.join(parts)
+
+    def generate_batch(self, grammar, count):
+        """
+        Generate a batch of names from a grammar.
+        Big batches have all the random choices for each slot drawn in one go with numpy, if it is installed.
+        :param grammar:
+        :param count:
+        :return: list
+        """
+        if numpy is None or count < self.NUMPY_BATCH_SIZE:
+            return [self.generate_name(grammar) for x in range(count)]
+
+        # Seed numpy from our own generator, so seeded batches still come out the same every time
+        rng = numpy.random.default_rng(self.rng.getrandbits(64))
+        formats = rng.integers(0, len(grammar.formats), size=count)
+
+        # Work out how many choices we need from each slot list, then draw them all at once
+        needed = numpy.bincount(formats, minlength=len(grammar.formats)) @ grammar.get_slot_counts()
+        draws = [rng.integers(0, len(choices), size=int(amount)).tolist() for choices, amount in zip(grammar.slots, needed)]
+        positions = [0] * len(grammar.slots)
+
+        names = []
+        for format in formats.tolist():
+
+            # The last chosen element, so we don't have the same thing twice in a row
+            last = ''
+            parts = []
+
+            for token in grammar.formats[format]:
+
+                if isinstance(token, int):
+
+                    choices = grammar.slots[token]
+                    choice = choices[draws[token][positions[token]]]
+                    positions[token] += 1
 
                     # Make sure it's not the same as the last one.
                     # Only try a maximum of self.MAX_RETRIES times though, we don't want a situation where an infinite loop could happen
-                    while len(choice) > 2 and choice == self._last and i < self.MAX_RETRIES:
+                    i = 0
+                    while len(choice) > 2 and choice == last and i < self.MAX_RETRIES:
                         i += 1
-                        choice = random.choice(choices[match])
+                        choice = self.rng.choice(choices)
+
+                    last = choice
+                    parts.append(choice)
 
-                    self._last = choice
-                    return choice
                 else:
-                    self._last = match
-                    return match
+                    parts.append(token)
+
+            names.append(''.join(parts))
+
+        return names
+
+    def format_names(self, names):
+        """
+        Uppercase the first letter of each word, if it's anything but idea generation or prompt generation
+        :param names:
+        :return: list
+        """
+        if self.type != 'idea' and self.type != 'prompt':
+            return [string.capwords(name) for name in names]
+        return names
+
+    def generate_bulk(self, count, unique=False):
+        """
+        Generate a lot of names at once, e.g. to pre-fill a list or export them. There is no MAX_AMOUNT limit here.
+        :param count:
+        :param unique: Remove any duplicates, so there can be fewer than `count` names
+        :return: list
+        """
+        grammar = self.get_grammar()
+        if grammar is None:
+            return []
+
+        names = self.generate_batch(grammar, count)
+        if unique:
+            names = list(dict.fromkeys(names))
+
+        return self.format_names(names)
+
+    def export(self, file, count, unique=True):
+        """
+        Generate a lot of names and write them to a file, one per line
+        :param file:
+        :param count:
+        :param unique:
+        :return: int Number of names written
+        """
+        names = self.generate_bulk(count, unique)
+        with open(file, 'w', encoding='utf-8') as output:
+            output.write('\n'.join(names) + '\n')
+
+        return len(names)
 
+    def generate(self, amount):
 
-            # Loop as many times as the amount we requested, and build up a generated name for each
-            x = 0
-            while x < amount:
+        # If the amount if higher than the max, set it to the max
+        if amount > self.MAX_AMOUNT:
+            amount = self.MAX_AMOUNT
 
-                x += 1
+        # If it's less than 1 for any reason, just use the default
+        if amount is None or amount < 1:
+            amount = self.DEFAULT_AMOUNT
 
-                # Get the formats from the source data
-                formats = source['formats']
+        # # If the type is 'idea' or 'prompt', change the amount to 1, as that will take up too much space.
+        # if self.type == 'idea' or self.type == 'prompt':
+        #     amount = 1
+
+        grammar = self.get_grammar()
+        generated_names = []
+
+        # If we loaded the asset source okay, then let's generate some responses
+        if grammar is not None:
 
-                # Pick a random one to use
-                format = random.choice(formats)
+            seen = set()
+            retry_attempts = 0
 
-                # Variable to store the last chosen element, so we don't have the same thing twice in a row
-                self._last = ''
+            while len(generated_names) < amount:
 
-                # Generate a name
-                name = re.sub(r"\$([a-z0-9]+)", replace, format)
+                name = self.generate_name(grammar)
 
-                # If we've already had this exact one, try again, up to self.MAX_RETRIES times
-                if name in generated_names and retry_attempts < self.MAX_RETRIES:
-                    x -= 1
+                # If we've already had this exact one, try again, up to self.MAX_RETRIES times for each name
+                if name in seen and retry_attempts < self.MAX_RETRIES:
                     retry_attempts += 1
-                else:
-                    # Add it to the return array
-                    generated_names.append(name)
-                    retry_attempts = 0
+                    continue
+
+                seen.add(name)
+                generated_names.append(name)
+                retry_attempts = 0
 
         # Sort the results alphabetically
         generated_names.sort()
-
-        # Uppercase the first letter of each word, if it's anything but idea generation or prompt generatio
-        if self.type != 'idea' and self.type != 'prompt':
-            generated_names = map(lambda el : string.capwords(el), generated_names)
+        generated_names = self.format_names(generated_names)
 
         # Generate the message
         message = lib.get_string('generate:message', self.context.guild.id).format(
@@ -104,4 +296,4 @@ class NameGenerator:
         return {
             'names': generated_names,
             'message': message
-        }
\ No newline at end of file
+        }
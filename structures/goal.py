@@ -1,6 +1,5 @@
-import lib, pytz, time
+import lib, time
 from structures.db import Database
-from structures.user import User
 
 class Goal:
 
@@ -17,15 +16,63 @@ class Goal:
         # Find all the user_goal records which are due a reset
         now = int(time.time())
 
-        records = self.__db.get_all_sql('SELECT * FROM user_goals WHERE reset <= %s', [now])
-        for record in records:
+        # This can be a lot of rows at midnight, so stream them in batches rather than loading them all at once.
+        async for records in self.__db.iter_sql('SELECT * FROM user_goals WHERE reset <= %s', [now]):
 
-            # Calculate the next reset time for the goal, depending on its type.
-            user = User(record['user'], 0)
-            try:
-                user.reset_goal(record)
-            except pytz.exceptions.UnknownTimeZoneError:
-                lib.out('[ERROR] Invalid timezone (' + user.get_setting('timezone') + ') for user ' + str(record['user']))
+            history = []
+            resets = []
+
+            # Get the timezones of all the users in the batch in one query, rather than loading each user's settings.
+            timezones = self.get_timezones(set(record['user'] for record in records))
+
+            # Then calculate the reset times once for each timezone and goal type, instead of for every goal.
+            goals = [(timezones.get(record['user'], 'UTC'), record['type']) for record in records]
+            goal_resets = lib.get_goal_resets(goals)
+
+            for record, goal in zip(records, goals):
+
+                if goal not in goal_resets:
+                    lib.out('[ERROR] Invalid timezone (' + goal[0] + ') for user ' + str(record['user']))
+                    continue
+
+                reset, date = goal_resets[goal]
+                history.append({
+                    'user': record['user'],
+                    'type': record['type'],
+                    'date': date,
+                    'goal': record['goal'],
+                    'result': record['current'],
+                    'completed': record['completed']
+                })
+                resets.append({'id': record['id'], 'completed': 0, 'current': 0, 'reset': reset})
+
+            for goal, (reset, date) in goal_resets.items():
+                lib.debug('Setting next ' + goal[1] + ' goal reset time for users in ' + goal[0] + ' to: ' + str(reset))
+
+            # Save the history records and the reset goals for each batch, instead of 2 queries per goal.
+            # They are saved together, so a failure can't record the history without resetting the goals.
+            with self.__db.transaction():
+                self.__db.insert_many('user_goals_history', history)
+                self.__db.update_many('user_goals', resets, ['id'])
 
         return True
 
+    def get_timezones(self, users):
+        """
+        Get the timezone setting of each of the users
+        :param users:
+        :return: dict of user => timezone, by its proper name if it is valid. Users without one are left out.
+        """
+        if not users:
+            return {}
+
+        users = list(users)
+        sql = 'SELECT user, value FROM user_settings WHERE setting = %s AND user IN (' + ','.join(['%s'] * len(users)) + ')'
+
+        timezones = {}
+        for row in self.__db.get_all_sql(sql, ['timezone'] + users):
+            if row['value']:
+                timezones[row['user']] = lib.get_timezone_name(row['value']) or row['value']
+
+        return timezones
+
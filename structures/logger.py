@@ -0,0 +1,160 @@
+import atexit, logging, os, queue, re, sys, threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from structures.singleton import Singleton
+
+class RateLimitFilter(logging.Filter):
+    """
+    Only let `rate` records with the same message (ignoring any numbers in it, like user and guild IDs) through every
+    `period` seconds, so a line which is logged for every user, guild or task doesn't flood the log.
+    The number of records which were dropped is added to the next one which is let through.
+    """
+
+    NUMBERS = re.compile(r'\d+')
+    MAX_WINDOWS = 1000
+
+    def __init__(self, rate, period, level=logging.DEBUG):
+        """
+        :param rate:
+        :param period: Seconds
+        :param level: Only records at this level or below are rate limited
+        """
+        super().__init__()
+        self.rate = rate
+        self.period = period
+        self.level = level
+
+        # message => [start of the current period, records in it, records dropped]
+        self.__windows = {}
+        self.__lock = threading.Lock()
+
+    def filter(self, record):
+
+        if self.rate <= 0 or record.levelno > self.level:
+            return True
+
+        key = self.NUMBERS.sub('#', str(record.msg))
+        now = record.created
+
+        with self.__lock:
+
+            window = self.__windows.get(key)
+            if window is None or now - window[0] >= self.period:
+
+                if window is not None and window[2] > 0:
+                    record.msg = str(record.msg) + ' (' + str(window[2]) + ' similar messages suppressed)'
+
+                # Don't keep the periods of every message we have ever seen
+                if window is None and len(self.__windows) >= self.MAX_WINDOWS:
+                    self.__windows = {k: w for k, w in self.__windows.items() if now - w[0] < self.period}
+
+                window = self.__windows[key] = [now, 0, 0]
+
+            window[1] += 1
+            if window[1] > self.rate:
+                window[2] += 1
+                return False
+
+        return True
+
+@Singleton
+class Logger:
+    """
+    Writes the lib.out/debug/error messages from a background thread, so logging never blocks the event loop.
+    Messages are put on a queue, then written to stdout (out and debug), the rotating error log (error) or the
+    slow query log.
+    It starts with the default level and limits, until `configure` is called with the bot's settings.
+    """
+
+    DEFAULT_LEVEL = 'DEBUG'
+    DEFAULT_DEBUG_RATE = 10 # Messages
+    DEFAULT_DEBUG_PERIOD = 60 # Seconds
+    DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+    DEFAULT_BACKUP_COUNT = 5
+    ERROR_LOG = 'logs/error.log'
+    SLOW_LOG = 'logs/slow.log'
+    FORMAT = '[%(asctime)s]%(message)s'
+    DATE_FORMAT = '%Y-%m-%d, %H:%M:%S'
+
+    def __init__(self):
+
+        self.__path = os.path.abspath(os.path.dirname(__file__))
+        os.makedirs(self.__path + '/../logs', exist_ok=True)
+
+        formatter = logging.Formatter(self.FORMAT, self.DATE_FORMAT)
+
+        # Errors only go to the error log, like they always have, and slow queries only go to the slow query log
+        console = logging.StreamHandler(sys.stdout)
+        console.setFormatter(formatter)
+        console.addFilter(lambda record: record.levelno < logging.ERROR and record.name != 'writerbot.slow')
+
+        errors = RotatingFileHandler(self.__path + '/../' + self.ERROR_LOG, maxBytes=self.DEFAULT_MAX_BYTES, backupCount=self.DEFAULT_BACKUP_COUNT, encoding='utf-8', delay=True)
+        errors.setFormatter(formatter)
+        errors.setLevel(logging.ERROR)
+        errors.addFilter(lambda record: record.name != 'writerbot.slow')
+
+        slow = RotatingFileHandler(self.__path + '/../' + self.SLOW_LOG, maxBytes=self.DEFAULT_MAX_BYTES, backupCount=self.DEFAULT_BACKUP_COUNT, encoding='utf-8', delay=True)
+        slow.setFormatter(formatter)
+        slow.addFilter(lambda record: record.name == 'writerbot.slow')
+
+        self.__files = (errors, slow)
+
+        self.__queue = queue.SimpleQueue()
+        self.__listener = QueueListener(self.__queue, console, errors, slow, respect_handler_level=True)
+        self.__listener.start()
+
+        # Records below the level, or over the rate limit, are dropped before they are queued
+        self.__logger = logging.getLogger('writerbot')
+        self.__logger.propagate = False
+        self.__logger.setLevel(self.DEFAULT_LEVEL)
+        self.__rate_limit = RateLimitFilter(self.DEFAULT_DEBUG_RATE, self.DEFAULT_DEBUG_PERIOD)
+        self.__logger.addFilter(self.__rate_limit)
+        self.__logger.addHandler(QueueHandler(self.__queue))
+
+        # Slow queries aren't rate limited or dropped by the level, as they are what we are looking for in that log
+        self.__slow = logging.getLogger('writerbot.slow')
+        self.__slow.propagate = False
+        self.__slow.setLevel(logging.INFO)
+        self.__slow.addHandler(QueueHandler(self.__queue))
+
+        # Write anything still on the queue before the process exits
+        atexit.register(self.stop)
+
+    def configure(self, config):
+        """
+        Set the level and limits from the bot's settings. Any which aren't in the settings keep their default.
+        :param config: The settings object, e.g. from lib.get_config()
+        :return:
+        """
+        self.__logger.setLevel(str(getattr(config, 'log_level', self.DEFAULT_LEVEL)).upper())
+        self.__rate_limit.rate = int(getattr(config, 'log_debug_rate', self.DEFAULT_DEBUG_RATE))
+        self.__rate_limit.period = float(getattr(config, 'log_debug_period', self.DEFAULT_DEBUG_PERIOD))
+
+        for handler in self.__files:
+            handler.maxBytes = int(getattr(config, 'log_max_bytes', self.DEFAULT_MAX_BYTES))
+            handler.backupCount = int(getattr(config, 'log_backup_count', self.DEFAULT_BACKUP_COUNT))
+
+    def log(self, level, txt):
+        """
+        Queue a message to be logged
+        :param level: logging level, e.g. logging.INFO
+        :param txt:
+        :return:
+        """
+        self.__logger.log(level, txt)
+
+    def slow(self, txt):
+        """
+        Queue a line for the slow query log
+        :param txt:
+        :return:
+        """
+        self.__slow.info(txt)
+
+    def stop(self):
+        """
+        Write out any queued messages and stop the background thread
+        :return:
+        """
+        if self.__listener is not None:
+            self.__listener.stop()
+            self.__listener = None
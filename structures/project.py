@@ -129,7 +129,10 @@ class Project:
         :return:
         """
         self._words += int(amount)
-        return self.__db.update('projects', {'words': self._words}, {'id': self._id})
+
+        # Add the words in one statement, so concurrent updates can't overwrite each other. This is a plain UPDATE, as
+        # an upsert would insert a new project without a user or name if this one has just been deleted.
+        return self.__db.execute('UPDATE projects SET words = words + %s WHERE id = %s', [int(amount), self._id])
 
     def update(self, amount):
         """
@@ -0,0 +1,168 @@
+import lib, os, re, sys, threading, time
+from functools import lru_cache
+from structures.logger import Logger
+from structures.singleton import Singleton
+
+# Files whose frames are skipped when working out which structure method ran a query
+INTERNAL_FILES = ('db.py', 'querystats.py', 'contextlib.py', 'functools.py', 'thread.py', 'threading.py')
+
+@lru_cache(maxsize=1024)
+def parse_sql(sql):
+    """
+    Work out the operation and table of a raw SQL query, e.g. ('select', 'user_goals')
+    :param sql:
+    :return: tuple
+    """
+    operation = re.match(r'\s*(\w+)', sql)
+    table = re.search(r'\b(?:FROM|INTO|UPDATE)\s+`?(\w+)', sql, re.IGNORECASE)
+    return (operation.group(1).lower() if operation else 'unknown', table.group(1) if table else 'unknown')
+
+def redact(sql):
+    """
+    Remove any literal values from a query, so user IDs, messages, etc... don't end up in the log
+    :param sql:
+    :return:
+    """
+    sql = re.sub(r"'(?:[^'\\]|\\.)*'", '?', sql)
+    return re.sub(r'\b\d+\b', '?', sql)
+
+def get_caller():
+    """
+    Find the structure/cog method which ran the query, by going back up the stack until we are out of the database code
+    :return: string e.g. 'Sprint.complete_user'
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+
+        filename = os.path.basename(frame.f_code.co_filename)
+        if filename not in INTERNAL_FILES:
+
+            # Methods get the class name from `self`. Static ones (like Task.execute_all) just get the module name.
+            owner = frame.f_locals.get('self')
+            if owner is not None:
+                return type(owner).__name__ + '.' + frame.f_code.co_name
+            return os.path.splitext(filename)[0] + '.' + frame.f_code.co_name
+
+        frame = frame.f_back
+
+    return 'unknown'
+
+@Singleton
+class QueryStats:
+    """
+    In-memory timings of the database queries, grouped by (table, operation), with any slow queries written to a log.
+    """
+
+    # Upper bounds (ms) of the latency histogram buckets. Anything slower goes into a final overflow bucket.
+    BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+    DEFAULT_SLOW_QUERY_MS = 500
+
+    def __init__(self):
+
+        config = lib.get_config()
+        self.__slow_ms = float(getattr(config, 'db_slow_query_ms', self.DEFAULT_SLOW_QUERY_MS))
+
+        # Queries can be run from the offload/pool worker threads, as well as the event loop
+        self.__lock = threading.Lock()
+        self.__stats = {}
+        self.__since = time.time()
+
+    def record(self, operation, table, caller, duration, sql):
+        """
+        Record the time taken by a query
+        :param operation: e.g. 'select'
+        :param table:
+        :param caller: The structure method which ran the query
+        :param duration: Seconds
+        :param sql: The SQL, with placeholders for its parameters
+        :return:
+        """
+        ms = duration * 1000
+
+        with self.__lock:
+
+            stat = self.__stats.get((table, operation))
+            if stat is None:
+                stat = self.__stats[(table, operation)] = {
+                    'table': table,
+                    'operation': operation,
+                    'count': 0,
+                    'total': 0.0,
+                    'max': 0.0,
+                    'histogram': [0] * (len(self.BUCKETS) + 1),
+                    'callers': {}
+                }
+
+            stat['count'] += 1
+            stat['total'] += ms
+            stat['max'] = max(stat['max'], ms)
+            stat['histogram'][self.__bucket(ms)] += 1
+            stat['callers'][caller] = stat['callers'].get(caller, 0) + ms
+
+        if ms >= self.__slow_ms:
+            self.log_slow_query(operation, table, caller, ms, sql)
+
+    def __bucket(self, ms):
+        """
+        Get the index of the histogram bucket for this time
+        :param ms:
+        :return: int
+        """
+        for i, bound in enumerate(self.BUCKETS):
+            if ms <= bound:
+                return i
+        return len(self.BUCKETS)
+
+    def log_slow_query(self, operation, table, caller, ms, sql):
+        """
+        Write a slow query to the slow query log, with any values redacted.
+        The line is queued for the Logger's background thread, so we don't block on the file here.
+        :return:
+        """
+        Logger.instance().slow('[SLOW][' + '{:.1f}'.format(ms) + 'ms][' + table + '.' + operation + '][' + caller + '] ' + redact(sql))
+
+    def percentile(self, stat, percent):
+        """
+        Get the histogram bucket bound (ms) which the given percentage of queries were under
+        :param stat:
+        :param percent:
+        :return: float
+        """
+        target = stat['count'] * percent / 100
+        seen = 0
+        for i, count in enumerate(stat['histogram']):
+            seen += count
+            if seen >= target:
+                return self.BUCKETS[i] if i < len(self.BUCKETS) else stat['max']
+        return stat['max']
+
+    def top(self, limit=10):
+        """
+        Get the (table, operation) stats with the most total time
+        :param limit:
+        :return: list
+        """
+        with self.__lock:
+            stats = [dict(stat, callers=dict(stat['callers'])) for stat in self.__stats.values()]
+
+        for stat in stats:
+            stat['percentile'] = self.percentile(stat, 95)
+
+        stats.sort(key=lambda stat: stat['total'], reverse=True)
+        return stats[:limit]
+
+    def get_since(self):
+        """
+        Get the timestamp we started recording from
+        :return:
+        """
+        return self.__since
+
+    def reset(self):
+        """
+        Clear all the recorded stats
+        :return:
+        """
+        with self.__lock:
+            self.__stats = {}
+            self.__since = time.time()
@@ -70,8 +70,9 @@ class Reminder:
 
         now = int(time.time())
 
-        # Find all reminders which are pending.
-        records = self.__db.get_all_sql('SELECT id FROM reminders WHERE time <= %s', [now])
+        # Find all reminders which are pending. There are only a few each time this runs, so read them all before we
+        # start sending, rather than holding a cursor open while we wait on Discord.
+        records = await self.__db.get_all_sql_async('SELECT id FROM reminders WHERE time <= %s', [now])
         for record in records:
 
             reminder = Reminder(record['id'])
@@ -1,6 +1,6 @@
 import lib, math, numpy, time
 from operator import itemgetter
-from structures.db import Database
+from structures.db import Database, DatabasePool
 from structures.event import Event
 from structures.guild import Guild
 from structures.project import Project
@@ -22,6 +22,8 @@ class Sprint:
 
     SPRINT_TYPE_NO_WORDCOUNT = "no_wordcount"
 
+    MEMBER_QUERY_LIMIT = 100 # The most members Discord will let us look up in one query
+
     def __init__(self, guild_id, bot=None):
 
         # Initialise the database instance and bot (if supplied)
@@ -342,165 +344,190 @@ class Sprint:
 
         self.__db.update('sprint_users', update, {'sprint': self._id, 'user': user_id})
 
-    async def complete(self, context=None, bot=None):
+    async def complete_user(self, user_sprint, event=None, context=None, bot=None):
         """
-        Finish the sprint, calculate all the WPM and XP and display results
-        :return:
+        Calculate the WPM, XP and stats for one user's sprint_users record, when the sprint is completed
+        :param user_sprint: The sprint_users record
+        :param event: The Event running on this server, if there is one
+        :return: dict|None The user's result, or None if they didn't declare a word count
         """
+        user = User(user_sprint['user'], self._guild, context=context, bot=bot, channel=self.get_channel())
 
-        # Print the 'Results coming up shortly' message
-        await self.say(lib.get_string('sprint:resultscomingsoon', self._guild), context, bot)
+        # Any level up or goal messages are sent once the results have been saved, rather than inside the transaction
+        user.defer_messages()
 
-        # Create array to use for storing the results
-        results = []
+        # If it's a non-word count sprint, we don't need to do anything with word counts.
+        if user_sprint['sprint_type'] == Sprint.SPRINT_TYPE_NO_WORDCOUNT:
 
-        # If the sprint has already completed, stop.
-        if self._completed != 0:
-            return
+            # Just give them the completed sprint stat and XP.
+            await user.add_xp(Experience.XP_COMPLETE_SPRINT)
+            user.add_stat('sprints_completed', 1)
 
-        # Mark this sprint as complete so the cron doesn't pick it up and start processing it again
-        self.set_complete()
+            # Push user to results
+            return {
+                'user': user,
+                'wordcount': 0,
+                'xp': Experience.XP_COMPLETE_SPRINT,
+                'type': user_sprint['sprint_type']
+            }
 
-        # Get all the users taking part
-        users = self.get_users()
+        else:
 
-        # Loop through them and get their full sprint info
-        for user_id in users:
+            # If they didn't submit an ending word count, use their current one and update the DB row with it.
+            if user_sprint['ending_wc'] == 0:
 
-            user = User(user_id, self._guild, context=context, bot=bot, channel=self.get_channel())
-            user_sprint = self.get_user_sprint(user_id)
+                user_sprint['ending_wc'] = user_sprint['current_wc']
+                self.update_user(user.get_id(), ending=user_sprint['ending_wc'])
 
-            # If it's a non-word count sprint, we don't need to do anything with word counts.
-            if user_sprint['sprint_type'] == Sprint.SPRINT_TYPE_NO_WORDCOUNT:
+            # Now we only process their result if they have declared something and it's different to their starting word count
+            user_sprint['starting_wc'] = int(user_sprint['starting_wc'])
+            user_sprint['current_wc'] = int(user_sprint['current_wc'])
+            user_sprint['ending_wc'] = int(user_sprint['ending_wc'])
+            user_sprint['timejoined'] = int(user_sprint['timejoined'])
 
-                # Just give them the completed sprint stat and XP.
-                await user.add_xp(Experience.XP_COMPLETE_SPRINT)
-                user.add_stat('sprints_completed', 1)
+            if user_sprint['ending_wc'] > 0 and user_sprint['ending_wc'] != user_sprint['starting_wc']:
 
-                # Push user to results
-                results.append({
-                    'user': user,
-                    'wordcount': 0,
-                    'xp': Experience.XP_COMPLETE_SPRINT,
-                    'type': user_sprint['sprint_type']
-                })
+                wordcount = user_sprint['ending_wc'] - user_sprint['starting_wc']
+                time_sprinted = self._end_reference - user_sprint['timejoined']
 
-            else:
+                # If for some reason the timejoined or sprint.end_reference are 0, then use the defined sprint length instead
+                if user_sprint['timejoined'] <= 0 or self._end_reference == 0:
+                    time_sprinted = self._length
 
-                # If they didn't submit an ending word count, use their current one and update the DB row with it.
-                if user_sprint['ending_wc'] == 0:
+                # Calculate the WPM from their time sprinted
+                wpm = Sprint.calculate_wpm(wordcount, time_sprinted)
 
-                    user_sprint['ending_wc'] = user_sprint['current_wc']
-                    self.update_user(user_id, ending=user_sprint['ending_wc'])
+                # See if it's a new record for the user
+                user_record = user.get_record('wpm')
+                wpm_record = True if user_record is None or wpm > int(user_record) else False
+
+                # If it is a record, update their record in the database
+                if wpm_record:
+                    user.update_record('wpm', wpm)
+
+                # Give them XP for finishing the sprint
+                await user.add_xp(Experience.XP_COMPLETE_SPRINT)
+
+                # Increment their stats
+                user.add_stat('sprints_completed', 1)
+                user.add_stat('sprints_words_written', wordcount)
+                user.add_stat('total_words_written', wordcount)
 
-                # Now we only process their result if they have declared something and it's different to their starting word count
-                user_sprint['starting_wc'] = int(user_sprint['starting_wc'])
-                user_sprint['current_wc'] = int(user_sprint['current_wc'])
-                user_sprint['ending_wc'] = int(user_sprint['ending_wc'])
-                user_sprint['timejoined'] = int(user_sprint['timejoined'])
+                # Increment their words towards their goal
+                await user.add_to_goals(wordcount)
 
-                if user_sprint['ending_wc'] > 0 and user_sprint['ending_wc'] != user_sprint['starting_wc']:
+                # If they were writing in a Project, update its word count.
+                if user_sprint['project'] is not None:
+                    project = Project(user_sprint['project'])
+                    project.add_words(wordcount)
 
-                    wordcount = user_sprint['ending_wc'] - user_sprint['starting_wc']
-                    time_sprinted = self._end_reference - user_sprint['timejoined']
+                # is there an event running on this server?
+                if event is not None:
+                    event.add_words(user.get_id(), wordcount)
 
-                    # If for some reason the timejoined or sprint.end_reference are 0, then use the defined sprint length instead
-                    if user_sprint['timejoined'] <= 0 or self._end_reference == 0:
-                        time_sprinted = self._length
+                # Push user to results
+                return {
+                    'user': user,
+                    'wordcount': wordcount,
+                    'wpm': wpm,
+                    'wpm_record': wpm_record,
+                    'xp': Experience.XP_COMPLETE_SPRINT,
+                    'type': user_sprint['sprint_type']
+                }
 
-                    # Calculate the WPM from their time sprinted
-                    wpm = Sprint.calculate_wpm(wordcount, time_sprinted)
+        return None
 
-                    # See if it's a new record for the user
-                    user_record = user.get_record('wpm')
-                    wpm_record = True if user_record is None or wpm > int(user_record) else False
+    async def complete(self, context=None, bot=None):
+        """
+        Finish the sprint, calculate all the WPM and XP and display results
+        :return:
+        """
 
-                    # If it is a record, update their record in the database
-                    if wpm_record:
-                        user.update_record('wpm', wpm)
+        # All the messages are in the same language, so only look it up once.
+        strings = lib.strings(self._guild)
 
-                    # Give them XP for finishing the sprint
-                    await user.add_xp(Experience.XP_COMPLETE_SPRINT)
+        # Print the 'Results coming up shortly' message
+        await self.say(strings['sprint:resultscomingsoon'], context, bot)
 
-                    # Increment their stats
-                    user.add_stat('sprints_completed', 1)
-                    user.add_stat('sprints_words_written', wordcount)
-                    user.add_stat('total_words_written', wordcount)
+        # If the sprint has already completed, stop.
+        if self._completed != 0:
+            return
 
-                    # Increment their words towards their goal
-                    await user.add_to_goals(wordcount)
+        # Mark this sprint as complete so the cron doesn't pick it up and start processing it again
+        self.set_complete()
 
-                    # If they were writing in a Project, update its word count.
-                    if user_sprint['project'] is not None:
-                        project = Project(user_sprint['project'])
-                        project.add_words(wordcount)
+        # Get all the users taking part, along with their full sprint info, in one query from the connection pool.
+        pool = DatabasePool.instance()
+        user_sprints = await pool.get_all('sprint_users', {'sprint': self._id})
 
-                    # is there an event running on this server?
-                    event = Event.get_by_guild(self._guild)
-                    if event and event.is_running():
-                        event.add_words(user.get_id(), wordcount)
+        # Is there an event running on this server? This is the same for everyone, so we only need to check it once.
+        event = Event.get_by_guild(self._guild)
+        if event is not None and not event.is_running():
+            event = None
 
-                    # Push user to results
-                    results.append({
-                        'user': user,
-                        'wordcount': wordcount,
-                        'wpm': wpm,
-                        'wpm_record': wpm_record,
-                        'xp': Experience.XP_COMPLETE_SPRINT,
-                        'type': user_sprint['sprint_type']
-                    })
+        # Save all the users' results in one transaction, so we only commit once instead of for every write.
+        with self.__db.transaction():
 
+            # Process each user's result in turn, as they all use the same Database connection.
+            results = []
+            for user_sprint in user_sprints:
+                result = await self.complete_user(user_sprint, event, context, bot)
+                if result is not None:
+                    results.append(result)
 
+            # Sort the results
+            results = sorted(results, key=itemgetter('wordcount'), reverse=True)
 
-        # Sort the results
-        results = sorted(results, key=itemgetter('wordcount'), reverse=True)
+            # Now loop through them again and apply extra XP, depending on their position in the results
+            position = 1
+            highest_word_count = 0
 
-        # Now loop through them again and apply extra XP, depending on their position in the results
-        position = 1
-        highest_word_count = 0
+            for result in results:
 
-        for result in results:
+                if result['wordcount'] > highest_word_count:
+                    highest_word_count = result['wordcount']
+                # If the user finished in the top 5 and they weren't the only one sprinting, earn extra XP
+                is_sprint_winner = result['wordcount'] == highest_word_count
+                if position <= 5 and len(results) > 1:
 
-            if result['wordcount'] > highest_word_count:
-                highest_word_count = result['wordcount']
-            # If the user finished in the top 5 and they weren't the only one sprinting, earn extra XP
-            is_sprint_winner = result['wordcount'] == highest_word_count
-            if position <= 5 and len(results) > 1:
+                    extra_xp = math.ceil(Experience.XP_WIN_SPRINT / (self.WINNING_POSITION if is_sprint_winner else position))
+                    result['xp'] += extra_xp
+                    await result['user'].add_xp(extra_xp)
 
-                extra_xp = math.ceil(Experience.XP_WIN_SPRINT / (self.WINNING_POSITION if is_sprint_winner else position))
-                result['xp'] += extra_xp
-                await result['user'].add_xp(extra_xp)
+                # If they actually won the sprint, increase their stat by 1
+                # Since the results are in order, the highest word count will be set first
+                # which means that any subsequent users with the same word count have tied for 1st place
+                if position == 1 or result['wordcount'] == highest_word_count:
+                    result['user'].add_stat('sprints_won', 1)
 
-            # If they actually won the sprint, increase their stat by 1
-            # Since the results are in order, the highest word count will be set first
-            # which means that any subsequent users with the same word count have tied for 1st place
-            if position == 1 or result['wordcount'] == highest_word_count:
-                result['user'].add_stat('sprints_won', 1)
+                position += 1
 
-            position += 1
+        # Now the results have been committed, send the level up and goal messages we held back
+        for result in results:
+            await result['user'].send_deferred_messages()
 
         # Post the final message with the results
         if len(results) > 0:
 
             position = 1
-            message = lib.get_string('sprint:results:header', self._guild)
+            message = strings['sprint:results:header']
             for result in results:
 
                 if result['type'] == Sprint.SPRINT_TYPE_NO_WORDCOUNT:
-                    message = message + lib.get_string('sprint:results:row:nowc', self._guild).format(result['user'].get_mention(), result['xp'])
+                    message = message + strings.get('sprint:results:row:nowc', result['user'].get_mention(), result['xp'])
                 else:
 
-                    message = message + lib.get_string('sprint:results:row', self._guild).format(position, result['user'].get_mention(), result['wordcount'], result['wpm'], result['xp'])
+                    message = message + strings.get('sprint:results:row', position, result['user'].get_mention(), result['wordcount'], result['wpm'], result['xp'])
 
                     # If it's a new PB, append that string as well
                     if result['wpm_record'] is True:
-                        message = message + lib.get_string('sprint:results:pb', self._guild)
+                        message = message + strings['sprint:results:pb']
 
                 message = message + '\n'
                 position += 1
 
         else:
-            message = lib.get_string('sprint:nowordcounts', self._guild)
+            message = strings['sprint:nowordcounts']
 
         # Send the message, either via the context or directly to the channel
         await self.say(message, context, bot)
@@ -636,25 +663,25 @@ class Sprint:
         @return:
         """
         db = Database.instance()
-        count = 0
-        notify = db.get_all('user_settings', {'guild': context.guild.id, 'setting': 'sprint_notify', 'value': 1})
-        notify_ids = [int(row['user']) for row in notify]
-        if notify_ids:
+        purge = []
 
-            members = await context.guild.query_members(limit=100, cache=False, user_ids=notify_ids)
+        # Read all the users who want notifications first, so no connection is held while we wait on Discord.
+        sql = 'SELECT id, user FROM user_settings WHERE guild = %s AND setting = %s AND value = %s'
+        records = await db.get_all_sql_async(sql, [context.guild.id, 'sprint_notify', 1])
 
-            # Create a sub method to find a user in the members list by their id
-            def find_member(id):
-                for m in members:
-                    if m.id == id:
-                        return m
-                return None
+        # Discord only lets us look up 100 members at a time, so check them in batches of that.
+        for i in range(0, len(records), Sprint.MEMBER_QUERY_LIMIT):
+
+            notify = records[i:i + Sprint.MEMBER_QUERY_LIMIT]
+            notify_ids = [int(row['user']) for row in notify]
+            members = await context.guild.query_members(limit=Sprint.MEMBER_QUERY_LIMIT, cache=False, user_ids=notify_ids)
+            member_ids = set(m.id for m in members)
 
             # Go through the users who want notifications and delete any which aren't in the server now.
-            for row in notify:
-                if not find_member(int(row['user'])):
-                    db.delete('user_settings', {'id': row['id']})
-                    count += 1
+            purge += [row['id'] for row in notify if int(row['user']) not in member_ids]
+
+        db.delete_many('user_settings', 'id', purge)
+        count = len(purge)
 
         return count
 
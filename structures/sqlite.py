@@ -0,0 +1,143 @@
+import re, sqlite3
+from functools import lru_cache
+
+# MySQL only syntax used in the install files, updates and queries, with what it becomes in SQLite
+REPLACEMENTS = [
+    (re.compile(r'\bauto_increment\b', re.IGNORECASE), 'AUTOINCREMENT'),
+    (re.compile(r'\)\s*CHARACTER SET \w+( COLLATE \w+)?\s*;?\s*$', re.IGNORECASE), ')'),
+    (re.compile(r'\bADD COLUMN IF NOT EXISTS\b', re.IGNORECASE), 'ADD COLUMN'),
+    (re.compile(r'\bON DUPLICATE KEY UPDATE\b', re.IGNORECASE), 'ON CONFLICT DO UPDATE SET'),
+    (re.compile(r'\bVALUES\((\w+)\)'), r'excluded.\1'),
+    (re.compile(r'\bGREATEST\(', re.IGNORECASE), 'MAX('),
+    (re.compile(r'%s'), '?'),
+]
+
+# Column types don't need changing in SQLite, as it doesn't enforce them
+MODIFY_COLUMN = re.compile(r'^\s*ALTER TABLE \w+ MODIFY COLUMN\b', re.IGNORECASE)
+
+# Index names are per table in MySQL, but per database in SQLite, so they get the table name added to them
+INDEX = re.compile(r'^(\s*CREATE (?:UNIQUE )?INDEX IF NOT EXISTS )(\w+)( ON )(\w+)', re.IGNORECASE)
+
+@lru_cache(maxsize=1024)
+def translate(sql):
+    """
+    Translate a MySQL query into SQLite
+    :param sql:
+    :return: string, or None if the query has nothing to do in SQLite
+    """
+    if MODIFY_COLUMN.match(sql):
+        return None
+
+    sql = INDEX.sub(lambda match: match.group(1) + match.group(4) + '_' + match.group(2) + match.group(3) + match.group(4), sql)
+
+    for pattern, replacement in REPLACEMENTS:
+        sql = pattern.sub(replacement, sql)
+
+    return sql
+
+def connect(path):
+    """
+    Open a connection to an SQLite database file, in WAL mode so readers don't block the writer
+    :param path:
+    :return: Connection
+    """
+    return Connection(path)
+
+def _dict_factory(cursor, row):
+    return {column[0]: row[i] for i, column in enumerate(cursor.description)}
+
+class Connection:
+    """
+    Wraps an sqlite3 connection with the parts of the pymysql connection interface that the Database uses
+    """
+
+    BUSY_TIMEOUT = 5000
+
+    def __init__(self, path):
+
+        # Connections are used by the offload and pool worker threads, but only ever by one thread at a time
+        self.__connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.__connection.row_factory = _dict_factory
+        self.__connection.execute('PRAGMA journal_mode = WAL')
+        self.__connection.execute('PRAGMA synchronous = NORMAL')
+        self.__connection.execute('PRAGMA busy_timeout = ' + str(self.BUSY_TIMEOUT))
+        self.open = True
+
+    def cursor(self, cursorclass=None):
+        return Cursor(self.__connection)
+
+    def ping(self, reconnect=True):
+        pass
+
+    def autocommit(self, value):
+        # With an isolation level, sqlite3 opens a transaction before any writes, which is kept until commit/rollback
+        self.__connection.isolation_level = None if value else 'DEFERRED'
+
+    def begin(self):
+        if not self.__connection.in_transaction:
+            self.__connection.execute('BEGIN')
+
+    def commit(self):
+        if self.__connection.in_transaction:
+            self.__connection.execute('COMMIT')
+
+    def rollback(self):
+        if self.__connection.in_transaction:
+            self.__connection.execute('ROLLBACK')
+
+    def close(self):
+        self.open = False
+        self.__connection.close()
+
+class Cursor:
+    """
+    Wraps an sqlite3 cursor with the parts of the pymysql cursor interface that the Database uses.
+    Rows are returned as dicts, like pymysql's DictCursor.
+    """
+
+    def __init__(self, connection):
+        self.__cursor = connection.cursor()
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def execute(self, sql, params=None):
+        """
+        Translate and run the query
+        :return: int Affected rows (or -1 for a SELECT)
+        """
+        sql = translate(sql)
+        if sql is None:
+            self.rowcount = 0
+            return 0
+
+        try:
+            self.__cursor.execute(sql, params or [])
+        except sqlite3.OperationalError as e:
+            # Updates add columns which may already be there, which MySQL would skip with its IF NOT EXISTS
+            if 'duplicate column name' not in str(e):
+                raise
+
+        self.rowcount = self.__cursor.rowcount
+        return self.rowcount
+
+    def executemany(self, sql, params):
+        self.__cursor.executemany(translate(sql), params)
+        self.rowcount = self.__cursor.rowcount
+        return self.rowcount
+
+    def fetchone(self):
+        return self.__cursor.fetchone()
+
+    def fetchmany(self, size):
+        return self.__cursor.fetchmany(size)
+
+    def fetchall(self):
+        return self.__cursor.fetchall()
+
+    def close(self):
+        self.__cursor.close()
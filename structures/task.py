@@ -1,17 +1,20 @@
 import lib, time
-from structures.db import Database
+from structures.db import Database, DatabasePool
 
 class Task:
 
-    def __init__(self, id):
+    def __init__(self, id, record=None):
         """
         Load a Task object by its ID
         :param id:
+        :param record: The tasks record, if it has already been loaded
         """
         self.__db = Database.instance()
         self.id = None
 
-        record = self.__db.get('tasks', {'id': id})
+        if record is None:
+            record = self.__db.get('tasks', {'id': id})
+
         if record:
             self.id = record['id']
             self.type = record['type']
@@ -148,11 +151,13 @@ class Task:
         :return:
         """
         now = int(time.time())
-        db = Database.instance()
+        pool = DatabasePool.instance()
+
+        # Load the full task records in one go from the pool, so we don't block the event loop or need a query per task.
+        pending = await pool.get_all_sql('SELECT * FROM tasks WHERE time <= %s ORDER BY id ASC', [now])
+        tasks = [Task(row['id'], row) for row in pending]
 
-        pending = db.get_all_sql('SELECT id FROM tasks WHERE time <= %s ORDER BY id ASC', [now])
-        for row in pending:
-            task = Task(row['id'])
+        for task in tasks:
             if task.is_valid():
                 result = await task.run(bot)
 
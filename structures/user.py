@@ -20,6 +20,7 @@ class User:
         self._stats = None
         self._settings = None
         self._records = None
+        self._deferred = None
 
     def get_id(self):
         return self._id
@@ -112,13 +113,17 @@ class User:
         else:
             return None
 
-    def add_xp(self, amount):
+    async def add_xp(self, amount):
 
+        # Get their current level first, so we know if they have levelled up
         user_xp = self.get_xp()
-        if user_xp:
-            amount += int(user_xp['xp'])
+        current_level = user_xp['lvl'] if user_xp else 1
+
+        # Add the XP in one statement, so concurrent sprint/goal XP can't overwrite each other
+        result = self.__db.increment('user_xp', 'xp', int(amount), {'user': self._id})
 
-        return self.update_xp(amount)
+        await self.check_level_up(current_level)
+        return result
 
     async def update_xp(self, amount):
 
@@ -133,6 +138,16 @@ class User:
             current_level = 1
             result = self.__db.insert('user_xp', {'user': self._id, 'xp': amount})
 
+        await self.check_level_up(current_level)
+        return result
+
+    async def check_level_up(self, current_level):
+        """
+        Reload the user's XP after it has changed, and print the level up message if they have gone up a level
+        :param current_level: The level they were before the XP changed
+        :return:
+        """
+
         # Reload the XP onto the user object and into the user_xp variable
         self.load_xp()
         user_xp = self.get_xp()
@@ -141,8 +156,6 @@ class User:
         if user_xp['lvl'] > current_level:
             await self.say(lib.get_string('levelup', self._guild).format(self.get_mention(), user_xp['lvl']))
 
-        return result
-
     def get_challenge(self):
         return self.__db.get('user_challenges', {'user': self._id, 'completed': 0})
 
@@ -201,14 +214,13 @@ class User:
 
     def add_stat(self, name, amount):
 
-        # If the user already has a value for this stat, we want to get their current amount so we can increment it
-        user_stat = self.get_stat(name)
+        # Increment the stat in one statement, inserting it if the user doesn't have it yet
+        result = self.__db.increment('user_stats', 'value', int(amount), {'user': self._id, 'name': name})
 
-        if user_stat:
-            amount = int(amount) + int(user_stat)
+        # Clear the loaded stats, so they are reloaded with the new value next time they are needed
+        self._stats = None
 
-        # Now return the update_stat with the new amount (if incremented)
-        return self.update_stat(name, amount)
+        return result
 
     def get_settings(self):
 
@@ -401,20 +413,15 @@ class User:
         user_goal = self.get_goal(type)
         if user_goal:
 
-            value = int(amount) + int(user_goal['current'])
-            if value < 0:
-                value = 0
-
-            # Is the goal completed now?
-            already_completed = user_goal['completed']
-            completed = user_goal['completed']
-            if value >= user_goal['goal'] and not already_completed:
-                completed = 1
+            # Add the words in one statement, so concurrent wrote/sprint updates can't overwrite each other. It can't go below 0.
+            # This is a plain UPDATE, as an upsert would insert a goal with no target if it has just been deleted.
+            self.__db.execute('UPDATE user_goals SET current = GREATEST(current + %s, 0) WHERE id = %s', [int(amount), user_goal['id']])
 
-            self.__db.update('user_goals', {'current': value, 'completed': completed}, {'id': user_goal['id']})
+            # Is the goal completed now? Only one update can mark it as completed, so the XP is only given once.
+            completed = self.__db.execute('UPDATE user_goals SET completed = 1 WHERE id = %s AND completed = 0 AND current >= goal', [user_goal['id']])
 
             # If we just met the goal, increment the XP and print out a message
-            if completed and not already_completed:
+            if completed:
 
                 # Increment stat of goals completed
                 self.add_stat(type + '_goals_completed', 1)
@@ -473,53 +480,41 @@ class User:
         :param context:
         :return:
         """
+        # If messages are being held back, just keep it until they are sent
+        if self._deferred is not None:
+            return self._deferred.append(message)
+
         if self.__context is not None:
             return await self.__context.send(message)
         elif self.__bot is not None:
             channel = self.__bot.get_channel(int(self.__channel))
             return await channel.send(message)
 
-    def get_most_recent_sprint(self, current_sprint):
+    def defer_messages(self):
         """
-        Get the user's most recent sprint record, not including the current one (if they have joined already)
+        Hold back any messages the user is sent (e.g. level ups and goals met) until send_deferred_messages is called,
+        so we don't wait on Discord while a transaction is open
         :return:
         """
-        return self.__db.get_sql('SELECT * FROM sprint_users WHERE user = %s AND sprint != %s ORDER BY id DESC', [self.get_id(), current_sprint.get_id()])
+        if self._deferred is None:
+            self._deferred = []
 
-    def reset_goal(self, record):
+    async def send_deferred_messages(self):
         """
-        Reset a user's goal, inserting the current values into the history table and updating their current record.
-        @param record:
-        @return:
+        Send any messages which were held back by defer_messages, and stop holding them back
+        :return:
         """
-        # Add the current values to a new record in the history table.
-        self.__db.insert('user_goals_history', {
-            'user': record['user'],
-            'type': record['type'],
-            'date': self.get_previous_goal_date(record['type']),
-            'goal': record['goal'],
-            'result': record['current'],
-            'completed': record['completed']
-        })
-
-        # Calculate the next reset time for this goal.
-        next = self.calculate_user_reset_time(record['type'])
-
-        # Print out to the bot log what is happening.
-        lib.debug('Setting next ' + record['type'] + ' goal reset time for ' + str(record['user']) + ' to: ' + str(next))
+        messages = self._deferred or []
+        self._deferred = None
+        for message in messages:
+            await self.say(message)
 
-        # Update the goal record with the new reset time, resetting the completed and current values to 0.
-        self.__db.update('user_goals', {'completed': 0, 'current': 0, 'reset': next}, {'id': record['id']})
-
-    def get_previous_goal_date(self, type):
+    def get_most_recent_sprint(self, current_sprint):
         """
-        Given a type of goal, get the previous goal's date, for the history table.
-        E.g. a daily goal would give you yesterday's date. A monthly goal would give you the first of last month.
-        @param type:
-        @return:
+        Get the user's most recent sprint record, not including the current one (if they have joined already)
+        :return:
         """
-        timezone = self.get_setting('timezone') or 'UTC'
-        return lib.get_previous_date(timezone, type)
+        return self.__db.get_sql('SELECT * FROM sprint_users WHERE user = %s AND sprint != %s ORDER BY id DESC', [self.get_id(), current_sprint.get_id()])
 
     def get_goal_history(self, type):
         """
@@ -0,0 +1,54 @@
+import json, os, sys, tempfile
+import pytest
+
+# The tests run against a throwaway SQLite database, so they don't need a MySQL server or a settings.json
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import lib
+
+TMP_PATH = tempfile.mkdtemp(prefix='writerbot-tests-')
+SETTINGS = {
+    'prefix': '!',
+    'db_engine': 'sqlite',
+    'db_path': os.path.join(TMP_PATH, 'writerbot.db'),
+    'db_host': '',
+    'db_user': '',
+    'db_pass': '',
+    'db_name': '',
+}
+
+with open(os.path.join(TMP_PATH, 'settings.json'), 'w') as file:
+    json.dump(SETTINGS, file)
+
+# Point lib at the test settings before anything reads them
+lib.CONFIG_FILE = os.path.join(TMP_PATH, 'settings.json')
+lib.reload_config()
+
+from structures.db import Database
+from structures.cache import RowCache
+
+@pytest.fixture(scope='session')
+def db():
+    """
+    The Database, with the tables installed and all the updates run, the same as the bot does on boot
+    """
+    db = Database.instance()
+    db.install()
+
+    for file in sorted(os.listdir('data/updates')):
+        if file.endswith('.update'):
+            for sql in lib.get('data/updates/' + file):
+                db.execute(sql, [])
+
+    return db
+
+@pytest.fixture
+def cache(db):
+    """
+    The RowCache, emptied before each test
+    """
+    cache = RowCache.instance()
+    cache.clear()
+    return cache
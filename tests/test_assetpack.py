@@ -0,0 +1,63 @@
+import glob, json, os
+import pytest
+from structures import assetpack
+from structures.assetpack import AssetPack
+from structures.generator import Grammar, NameGenerator
+
+ASSETS = sorted(glob.glob(os.path.join(assetpack.SOURCE_PATH, '*', 'gen_*.json')))
+
+def load(source_file):
+    with open(source_file, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+@pytest.mark.parametrize('source_file', ASSETS, ids=lambda file: os.path.relpath(file, assetpack.SOURCE_PATH))
+def test_pack_grammar_matches_json_grammar(source_file, tmp_path):
+    pack_file = str(tmp_path / 'asset.bin')
+    assetpack.build(source_file, pack_file)
+
+    from_json = Grammar(load(source_file))
+    from_pack = Grammar(AssetPack(pack_file))
+
+    assert from_pack.formats == from_json.formats
+    assert [list(slot) for slot in from_pack.slots] == [list(slot) for slot in from_json.slots]
+
+    # So the same seed generates the same names from either of them
+    type = os.path.basename(source_file)[4:-5]
+    assert [NameGenerator(type, None, 1).generate_name(from_pack) for i in range(50)] == [NameGenerator(type, None, 1).generate_name(from_json) for i in range(50)]
+
+def test_missing_slots_and_literals(tmp_path):
+    source_file = str(tmp_path / 'gen_test.json')
+    with open(source_file, 'w', encoding='utf-8') as file:
+        json.dump({'names': {'first': ['Ana', 'Bö'], 'last': ['Smith']}, 'formats': ['$first $last', 'The $unknown of $last!', '$first']}, file)
+
+    pack_file = str(tmp_path / 'gen_test.bin')
+    assetpack.build(source_file, pack_file)
+
+    # Slots which aren't in the asset come out as their name
+    formats = [[0, ' ', 1], ['The ', 'unknown', ' of ', 1, '!'], [0]]
+    assert Grammar(load(source_file)).formats == formats
+    assert Grammar(AssetPack(pack_file)).formats == formats
+    assert list(AssetPack(pack_file).slots[0]) == ['Ana', 'Bö']
+
+def test_pack_is_only_current_after_source(tmp_path):
+    source_file = str(tmp_path / 'gen_test.json')
+    pack_file = str(tmp_path / 'gen_test.bin')
+    with open(source_file, 'w', encoding='utf-8') as file:
+        json.dump({'names': {'a': ['x']}, 'formats': ['$a']}, file)
+
+    assert not assetpack.is_current(source_file, pack_file)
+    assetpack.build(source_file, pack_file)
+    assert assetpack.is_current(source_file, pack_file)
+
+    # Changing the JSON asset means the pack needs building again
+    later = os.stat(pack_file).st_mtime + 10
+    os.utime(source_file, (later, later))
+    assert not assetpack.is_current(source_file, pack_file)
+
+def test_invalid_pack(tmp_path):
+    pack_file = str(tmp_path / 'bad.bin')
+    with open(pack_file, 'wb') as file:
+        file.write(b'\0' * assetpack.HEADER.size)
+
+    with pytest.raises(ValueError):
+        AssetPack(pack_file)
@@ -0,0 +1,58 @@
+import lib
+import pytest
+from types import SimpleNamespace
+
+# bot.py needs discord.py installed
+bot = pytest.importorskip('bot')
+
+class Bot:
+    """
+    Just the parts of the WriterBot the prefix map uses, without connecting to Discord
+    """
+    user = SimpleNamespace(id=1)
+    prefixes = None
+    load_prefixes = bot.WriterBot.load_prefixes
+    set_prefix = bot.WriterBot.set_prefix
+
+def message(guild_id):
+    return SimpleNamespace(guild=SimpleNamespace(id=guild_id) if guild_id is not None else None)
+
+def test_load_prefixes(db):
+    db.insert('guild_settings', {'guild': 501, 'setting': 'prefix', 'value': '?'})
+    db.insert('guild_settings', {'guild': 502, 'setting': 'lang', 'value': 'fr'})
+
+    writer_bot = Bot()
+    assert writer_bot.load_prefixes() == len(writer_bot.prefixes)
+    assert writer_bot.prefixes[501] == '?'
+    assert 502 not in writer_bot.prefixes
+
+def test_load_prefix_uses_map(db):
+    db.insert('guild_settings', {'guild': 503, 'setting': 'prefix', 'value': '$'})
+
+    writer_bot = Bot()
+    default = lib.get_config().prefix
+
+    # The map is loaded on first use, if setup hasn't loaded it already
+    assert '$' in bot.WriterBot.load_prefix(writer_bot, message(503))
+    assert writer_bot.prefixes is not None
+
+    assert default in bot.WriterBot.load_prefix(writer_bot, message(504))
+    assert default in bot.WriterBot.load_prefix(writer_bot, message(None))
+
+    # Once loaded, it doesn't go back to the database
+    db.delete('guild_settings', {'guild': 503, 'setting': 'prefix'})
+    assert '$' in bot.WriterBot.load_prefix(writer_bot, message(503))
+
+def test_set_prefix_updates_map(db):
+    writer_bot = Bot()
+    writer_bot.load_prefixes()
+
+    writer_bot.set_prefix(505, '%')
+    assert '%' in bot.WriterBot.load_prefix(writer_bot, message(505))
+
+    # Setting a prefix before the map is loaded loads it first, so other guilds' prefixes aren't lost
+    db.insert('guild_settings', {'guild': 506, 'setting': 'prefix', 'value': '&'})
+    writer_bot = Bot()
+    writer_bot.set_prefix(507, '+')
+    assert writer_bot.prefixes[506] == '&'
+    assert writer_bot.prefixes[507] == '+'
@@ -0,0 +1,125 @@
+from structures.cache import MISSING
+
+def test_get_is_cached(db, cache):
+    db.insert('guild_settings', {'guild': 301, 'setting': 'lang', 'value': 'en'})
+
+    assert db.get('guild_settings', {'guild': 301, 'setting': 'lang'})['value'] == 'en'
+    hits = cache.get_stats()['hits']
+    assert db.get('guild_settings', {'guild': 301, 'setting': 'lang'})['value'] == 'en'
+    assert cache.get_stats()['hits'] == hits + 1
+
+def test_cached_results_are_copies(db, cache):
+    db.insert('guild_settings', {'guild': 302, 'setting': 'lang', 'value': 'en'})
+
+    row = db.get('guild_settings', {'guild': 302, 'setting': 'lang'})
+    row['value'] = 'fr'
+    assert db.get('guild_settings', {'guild': 302, 'setting': 'lang'})['value'] == 'en'
+
+def test_update_invalidates_matching_results(db, cache):
+    db.insert('guild_settings', {'guild': 303, 'setting': 'lang', 'value': 'en'})
+    db.insert('guild_settings', {'guild': 304, 'setting': 'lang', 'value': 'en'})
+    db.get('guild_settings', {'guild': 303, 'setting': 'lang'})
+    db.get('guild_settings', {'guild': 304, 'setting': 'lang'})
+    db.get_all('guild_settings', {'setting': 'lang'})
+
+    db.update('guild_settings', {'value': 'fr'}, {'guild': 303, 'setting': 'lang'})
+
+    # The guild's own result and the list of every guild's language are out of date, the other guild's result isn't
+    hits = cache.get_stats()['hits']
+    assert db.get('guild_settings', {'guild': 303, 'setting': 'lang'})['value'] == 'fr'
+    assert {row['guild']: row['value'] for row in db.get_all('guild_settings', {'setting': 'lang'})}[303] == 'fr'
+    assert cache.get_stats()['hits'] == hits
+
+    assert db.get('guild_settings', {'guild': 304, 'setting': 'lang'})['value'] == 'en'
+    assert cache.get_stats()['hits'] == hits + 1
+
+def test_update_by_id_uses_cached_row(db, cache):
+    db.insert('guild_settings', {'guild': 305, 'setting': 'prefix', 'value': '!'})
+    db.insert('guild_settings', {'guild': 306, 'setting': 'prefix', 'value': '!'})
+    row = db.get('guild_settings', {'guild': 305, 'setting': 'prefix'})
+    db.get('guild_settings', {'guild': 306, 'setting': 'prefix'})
+
+    # We only know the ID being written, but the cached row tells us which guild it belongs to
+    db.update('guild_settings', {'value': '?'}, {'id': row['id']})
+
+    assert db.get('guild_settings', {'guild': 305, 'setting': 'prefix'})['value'] == '?'
+    hits = cache.get_stats()['hits']
+    assert db.get('guild_settings', {'guild': 306, 'setting': 'prefix'})['value'] == '!'
+    assert cache.get_stats()['hits'] == hits + 1
+
+def test_insert_invalidates_results_it_would_be_in(db, cache):
+    assert db.get('guild_settings', {'guild': 307, 'setting': 'lang'}) is None
+    db.get('guild_settings', {'guild': 308, 'setting': 'lang'})
+
+    db.insert('guild_settings', {'guild': 307, 'setting': 'lang', 'value': 'fr'})
+
+    assert db.get('guild_settings', {'guild': 307, 'setting': 'lang'})['value'] == 'fr'
+    hits = cache.get_stats()['hits']
+    assert db.get('guild_settings', {'guild': 308, 'setting': 'lang'}) is None
+    assert cache.get_stats()['hits'] == hits + 1
+
+def test_delete_invalidates(db, cache):
+    db.insert('guild_settings', {'guild': 309, 'setting': 'lang', 'value': 'fr'})
+    assert db.get('guild_settings', {'guild': 309, 'setting': 'lang'}) is not None
+
+    db.delete('guild_settings', {'guild': 309, 'setting': 'lang'})
+    assert db.get('guild_settings', {'guild': 309, 'setting': 'lang'}) is None
+
+def test_raw_sql_clears_table(db, cache):
+    db.insert('guild_settings', {'guild': 310, 'setting': 'lang', 'value': 'en'})
+    db.get('guild_settings', {'guild': 310, 'setting': 'lang'})
+
+    # We can't tell which rows a raw query wrote, so all of the table's results go
+    db.execute('UPDATE guild_settings SET value = %s WHERE guild = %s', ['fr', 310])
+    assert db.get('guild_settings', {'guild': 310, 'setting': 'lang'})['value'] == 'fr'
+
+def test_transaction_reads_bypass_cache(db, cache):
+    db.insert('guild_settings', {'guild': 311, 'setting': 'lang', 'value': 'en'})
+    db.get('guild_settings', {'guild': 311, 'setting': 'lang'})
+
+    with db.transaction():
+        db.update('guild_settings', {'value': 'fr'}, {'guild': 311, 'setting': 'lang'})
+        assert db.get('guild_settings', {'guild': 311, 'setting': 'lang'})['value'] == 'fr'
+
+    assert db.get('guild_settings', {'guild': 311, 'setting': 'lang'})['value'] == 'fr'
+
+def test_rolled_back_transaction_leaves_nothing_cached(db, cache):
+    db.insert('guild_settings', {'guild': 312, 'setting': 'lang', 'value': 'en'})
+
+    try:
+        with db.transaction():
+            db.update('guild_settings', {'value': 'fr'}, {'guild': 312, 'setting': 'lang'})
+            db.get('guild_settings', {'guild': 312, 'setting': 'lang'})
+            raise RuntimeError()
+    except RuntimeError:
+        pass
+
+    assert db.get('guild_settings', {'guild': 312, 'setting': 'lang'})['value'] == 'en'
+
+def test_stale_result_is_not_stored(cache):
+    key = cache.key('guild_settings', {'guild': 313}, ['*'], None, None, True)
+
+    # A write between running the query and storing its result means the result may already be out of date
+    generation = cache.get_generation('guild_settings')
+    cache.invalidate('guild_settings', {'guild': 313}, {'value': 'fr'})
+    cache.set(key, 'guild_settings', {'guild': 313}, {'guild': 313, 'value': 'en'}, generation)
+
+    assert cache.get(key) is MISSING
+
+def test_expired_and_evicted_results(cache):
+    size, ttl = cache.size, cache.ttl
+    try:
+        cache.size = 2
+        keys = [cache.key('guild_settings', {'guild': i}, ['*'], None, None, True) for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.set(key, 'guild_settings', {'guild': i}, {'guild': i}, cache.get_generation('guild_settings'))
+
+        # The least recently used one is dropped once we are over the size
+        assert cache.get(keys[0]) is MISSING
+        assert cache.get(keys[2]) == {'guild': 2}
+
+        cache.ttl = -1
+        cache.set(keys[1], 'guild_settings', {'guild': 1}, {'guild': 1}, cache.get_generation('guild_settings'))
+        assert cache.get(keys[1]) is MISSING
+    finally:
+        cache.size, cache.ttl = size, ttl
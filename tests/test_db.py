@@ -0,0 +1,180 @@
+import asyncio, lib, pytest
+from types import SimpleNamespace
+from structures import db as database
+
+def test_build_get_select_all():
+    assert database._build_get('user_goals', {'user': 1, 'type': 'daily'}) == ('SELECT * FROM user_goals WHERE user = %s AND type = %s', [1, 'daily'])
+    assert database._build_get('user_goals') == ('SELECT * FROM user_goals', [])
+
+def test_build_get_select_all_matches_full_template():
+    # The SELECT * fast path has to build exactly what the full template would
+    for where in (None, {'user': 1}, {'user': 1, 'type': 'daily'}):
+        keys = tuple(where) if where else None
+        assert database._build_get('user_goals', where)[0] == database._compile_get('user_goals', ('*',), keys, None, None)
+
+def test_template_caches_are_bounded():
+    for compile in (database._compile_select_all, database._compile_get, database._compile_insert, database._compile_update, database._compile_delete):
+        assert compile.cache_info().maxsize == database.TEMPLATE_CACHE_SIZE
+
+def test_build_get_fields_sort_limit():
+    sql, params = database._build_get('user_goals', {'user': 1}, ['id', 'current'], ['id DESC'], 5)
+    assert sql == 'SELECT id, current FROM user_goals WHERE user = %s ORDER BY id DESC LIMIT 5'
+    assert params == [1]
+
+    # A single field can be passed as a string
+    assert database._build_get('user_goals', {'user': 1}, 'id') == ('SELECT id FROM user_goals WHERE user = %s', [1])
+
+def test_build_get_params_follow_where_order():
+    # The template is cached by the WHERE keys, so the same keys in a different order must not share the params order
+    assert database._build_get('user_goals', {'type': 'daily', 'user': 1}) == ('SELECT * FROM user_goals WHERE type = %s AND user = %s', ['daily', 1])
+
+def test_build_insert_update_delete():
+    assert database._build_insert('user_goals', {'user': 1, 'type': 'daily'}) == ('INSERT INTO user_goals (user,type) VALUES (%s,%s)', [1, 'daily'])
+    assert database._build_update('user_goals', {'current': 2}, {'id': 3}) == ('UPDATE user_goals SET current = %s WHERE id = %s', [2, 3])
+    assert database._build_update('tasks', {'processing': 0}) == ('UPDATE tasks SET processing = %s', [0])
+    assert database._build_delete('tasks', {'id': 1}) == ('DELETE FROM tasks WHERE id = %s', [1])
+
+@pytest.mark.parametrize('build', [
+    lambda: database._build_get('user_goals; DROP TABLE user_goals'),
+    lambda: database._build_get('user_goals', {'user = 1 OR 1': 1}),
+    lambda: database._build_get('user_goals', None, ['id; DROP']),
+    lambda: database._build_insert('user_goals', {'user)': 1}),
+    lambda: database._build_update('user_goals', {'current': 1}, {'id OR 1': 1}),
+])
+def test_build_rejects_invalid_identifiers(build):
+    with pytest.raises(ValueError):
+        build()
+
+def test_get_runs_built_query(db):
+    db.insert('user_goals', {'user': 101, 'type': 'daily', 'goal': 500, 'current': 0, 'completed': 0, 'reset': 0})
+    assert db.get('user_goals', {'user': 101, 'type': 'daily'})['goal'] == 500
+    assert db.get('user_goals', {'user': 101}, ['goal'])['goal'] == 500
+    assert db.get('user_goals', {'user': 102}) is None
+
+def test_build_increment():
+    sql, params = database._build_increment('user_stats', 'value', 5, {'user': 1, 'name': 'words'})
+    assert sql == 'INSERT INTO user_stats (user,name,value) VALUES (%s,%s,%s) ON DUPLICATE KEY UPDATE value = value + %s'
+    assert params == [1, 'words', 5, 5]
+
+    # A new row starts at the minimum, if the delta would take it below
+    sql, params = database._build_increment('user_xp', 'xp', -5, {'user': 1}, None, 0)
+    assert sql == 'INSERT INTO user_xp (user,xp) VALUES (%s,%s) ON DUPLICATE KEY UPDATE xp = GREATEST(xp + %s, 0)'
+    assert params == [1, 0, -5]
+
+def test_increment_inserts_then_adds(db):
+    where = {'user': 201, 'name': 'total_words_written'}
+
+    db.increment('user_stats', 'value', 250, where)
+    db.increment('user_stats', 'value', 100, where)
+
+    rows = db.get_all('user_stats', where)
+    assert len(rows) == 1
+    assert rows[0]['value'] == 350
+
+def test_increment_only_touches_its_own_row(db):
+    db.increment('user_stats', 'value', 10, {'user': 202, 'name': 'sprints_completed'})
+    db.increment('user_stats', 'value', 20, {'user': 202, 'name': 'sprints_won'})
+    db.increment('user_stats', 'value', 30, {'user': 203, 'name': 'sprints_completed'})
+
+    assert db.get('user_stats', {'user': 202, 'name': 'sprints_completed'})['value'] == 10
+    assert db.get('user_stats', {'user': 202, 'name': 'sprints_won'})['value'] == 20
+    assert db.get('user_stats', {'user': 203, 'name': 'sprints_completed'})['value'] == 30
+
+def test_increment_minimum(db):
+    db.increment('user_xp', 'xp', -50, {'user': 204}, minimum=0)
+    assert db.get('user_xp', {'user': 204})['xp'] == 0
+
+    db.increment('user_xp', 'xp', 100, {'user': 204}, minimum=0)
+    db.increment('user_xp', 'xp', -150, {'user': 204}, minimum=0)
+    assert db.get('user_xp', {'user': 204})['xp'] == 0
+
+def test_increment_in_transaction(db):
+    where = {'event': 1, 'user': 205}
+
+    with db.transaction():
+        for i in range(10):
+            db.increment('user_events', 'words', 10, where)
+
+    assert db.get('user_events', where)['words'] == 100
+
+    # Nothing is written if the transaction is rolled back
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.increment('user_events', 'words', 10, where)
+            raise RuntimeError()
+
+    assert db.get('user_events', where)['words'] == 100
+
+def test_plain_update_increment_does_not_insert(db):
+    # Project words and goal progress are added with a plain UPDATE, so a deleted row isn't brought back
+    db.insert('user_goals', {'user': 206, 'type': 'daily', 'goal': 500, 'current': 0, 'completed': 0, 'reset': 0})
+    goal = db.get('user_goals', {'user': 206, 'type': 'daily'})
+
+    db.execute('UPDATE user_goals SET current = GREATEST(current + %s, 0) WHERE id = %s', [300, goal['id']])
+    db.execute('UPDATE user_goals SET current = GREATEST(current + %s, 0) WHERE id = %s', [-400, goal['id']])
+    assert db.get('user_goals', {'id': goal['id']})['current'] == 0
+
+    db.delete('user_goals', {'id': goal['id']})
+    assert db.execute('UPDATE user_goals SET current = GREATEST(current + %s, 0) WHERE id = %s', [300, goal['id']]) == 0
+    assert db.get_all('user_goals', {'user': 206}) == []
+
+def test_transaction_async(db):
+    from structures.db import DatabasePool
+
+    async def run():
+        pool = DatabasePool.instance()
+
+        # Database and pool calls in the block are committed together
+        async with db.transaction_async():
+            db.insert('user_stats', {'user': 207, 'name': 'sprints_won', 'value': 1})
+            await db.update_async('user_stats', {'value': 2}, {'user': 207, 'name': 'sprints_won'})
+            await pool.insert('user_stats', {'user': 207, 'name': 'sprints_completed', 'value': 3})
+            assert len(db.get_all('user_stats', {'user': 207})) == 2
+
+        # And rolled back together
+        with pytest.raises(RuntimeError):
+            async with db.transaction_async():
+                db.increment('user_stats', 'value', 10, {'user': 207, 'name': 'sprints_won'})
+                await pool.increment('user_stats', 'value', 10, {'user': 207, 'name': 'sprints_completed'})
+                raise RuntimeError()
+
+    asyncio.run(run())
+    assert {row['name']: row['value'] for row in db.get_all('user_stats', {'user': 207})} == {'sprints_won': 2, 'sprints_completed': 3}
+
+def test_unit_of_work(db):
+
+    @database.unit_of_work
+    async def command(fail):
+        db.insert('user_stats', {'user': 208, 'name': 'sprints_won', 'value': 1})
+        db.increment('user_stats', 'value', 1, {'user': 208, 'name': 'sprints_won'})
+        if fail:
+            raise RuntimeError()
+        return 'done'
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(command(True))
+    assert db.get_all('user_stats', {'user': 208}) == []
+
+    assert asyncio.run(command(False)) == 'done'
+    assert db.get('user_stats', {'user': 208, 'name': 'sprints_won'})['value'] == 2
+
+def test_offload_queue_stats(db, monkeypatch):
+    db.insert('user_stats', {'user': 209, 'name': 'sprints_won', 'value': 1})
+    db.insert('user_stats', {'user': 209, 'name': 'sprints_completed', 'value': 1})
+
+    # A Database of its own in offload mode, on the same database file
+    config = SimpleNamespace(**lib.get_config()._asdict(), db_offload=True, db_threads=2)
+    monkeypatch.setattr(lib, 'get_config', lambda: config)
+    offload = database.Database._cls()
+
+    async def run():
+        return await asyncio.gather(*[offload.get_all_async('user_stats', {'user': 209}) for i in range(5)])
+
+    assert all(len(rows) == 2 for rows in asyncio.run(run()))
+
+    stats = offload.get_queue_stats()
+    assert stats['threads'] == 2
+    assert stats['submitted'] == 5
+    assert stats['pending'] == 0
+    assert stats['peak'] == 5
+    assert stats['wait_max'] >= stats['wait_avg'] >= 0
@@ -0,0 +1,67 @@
+import asyncio
+import pytest
+from structures.db import DatabasePool
+
+# A query which keeps SQLite busy for a while, so there is time to cancel it
+SLOW_SQL = 'WITH RECURSIVE numbers(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM numbers WHERE x < 2000000) SELECT MAX(x) AS n FROM numbers'
+
+def new_pool(size):
+    """
+    A pool of its own, rather than the shared one, so each test starts with no connections and its own event loop
+    """
+    pool = DatabasePool._cls()
+    pool.size = size
+    return pool
+
+def test_cancelled_query_wakes_waiter(db):
+
+    async def run():
+        pool = new_pool(1)
+
+        slow = asyncio.create_task(pool.get_sql(SLOW_SQL, []))
+        await asyncio.sleep(0.05)
+
+        # The only connection is busy, so this has to wait for it
+        waiting = asyncio.create_task(pool.get_sql('SELECT 1 AS n', []))
+        await asyncio.sleep(0.05)
+        assert not waiting.done()
+
+        slow.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await slow
+
+        return await asyncio.wait_for(waiting, 10)
+
+    assert asyncio.run(run())['n'] == 1
+
+def test_broken_connection_wakes_waiter(db):
+
+    async def run():
+        pool = new_pool(1)
+        connection = await pool._DatabasePool__checkout()
+
+        waiting = asyncio.create_task(pool.get_sql('SELECT 1 AS n', []))
+        await asyncio.sleep(0.05)
+        assert not waiting.done()
+
+        # Drop the connection as if it was lost, rather than giving it back
+        pool._DatabasePool__checkin(connection, broken=True)
+
+        return await asyncio.wait_for(waiting, 10)
+
+    assert asyncio.run(run())['n'] == 1
+
+def test_cancelled_connect_frees_slot(db):
+
+    async def run():
+        pool = new_pool(1)
+
+        opening = asyncio.create_task(pool.get_sql('SELECT 1 AS n', []))
+        await asyncio.sleep(0)
+        opening.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await opening
+
+        return await asyncio.wait_for(pool.get_sql('SELECT 2 AS n', []), 10)
+
+    assert asyncio.run(run())['n'] == 2